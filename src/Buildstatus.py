@@ -11,20 +11,400 @@
 #                                                                                                       #
 #########################################################################################################
 
-# PYTHON IMPORTS
+# PYTHON IMPORTS (heavy modules like 'requests' are imported on first use, so the CLI starts fast; background work runs on 'Executor', not on twisted)
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from csv import writer as csvwriter
 from datetime import datetime, timedelta
 from getopt import getopt, GetoptError
-from json import loads, dump
+from hashlib import sha1
+from heapq import heappush, heappop, nsmallest
+from itertools import islice
+from json import loads, dump, dumps
+from os import environ, getpid, makedirs, remove, replace
+from os.path import dirname, expanduser, join
 from re import search, findall, S, M
-from requests import get, exceptions
-from sys import exit, argv
-from twisted.internet.reactor import callInThread
+from sys import exit, argv, stdout, getsizeof, intern
+from threading import Condition, Lock, Thread
+from time import time, perf_counter, sleep
 
 MODULE_NAME = __name__.split(".")[-1]
+CACHETIME = 60  # seconds a fetched or prefetched platform is considered as fresh
+COLUMNS = {"No": (3, ">"), "BoxName": (18, "<"), "OemName": (18, "<"), "BuildStatus": (12, ">"), "StartBuild": (20, "<"),  # column: (width, alignment)
+			"StartFeedSync": (20, "<"), "EndBuild": (20, "<"), "SyncTime": (9, ">"), "BuildTime": (10, ">")}
+BUILDSTATES = ["Building", "Complete", "Failed", "Waiting"]
+PRIORITIES = ["list", "status", "picture", "prefetch"]  # priority classes of 'Executor', highest first: visible list data, server status, box pictures, prefetch
+CONTENTURL = environ.get("OPENATVSTATUS_CONTENTURL", "http://api.mynonpublic.com/content.json")  # may point to a local stand-in server (see 'tools/standin.py')
+PLATFORMURL = environ.get("OPENATVSTATUS_PLATFORMURL")  # known platform page to bootstrap from, e.g. if no platform list has been cached yet
+PLATFORMCACHE = join(environ.get("XDG_CACHE_HOME") or join(expanduser("~"), ".cache"), "openatvstatus", "platforms.json")  # last known platform list
 
 
-class Buildstatus:
+class BuildResult(namedtuple("BuildResult", ["platform", "htmldict", "error", "timestamp"])):  # immutable result of a single platform fetch
+	__slots__ = ()
+
+	def findbuildbox(self):  # find boxname current image is build for
+		if self.htmldict:
+			for boxname, boxdata in self.htmldict["boxinfo"].items():
+				if "Building" in boxdata["BuildStatus"]:
+					return boxname
+
+	def hasbox(self, box):
+		return bool(self.htmldict) and box in self.htmldict["boxinfo"]
+
+	def summarize(self):  # aggregate figures of the platform for overviews (see 'Summary'), evaluated in a single traversal
+		cycletime, counter, failed = self.evaluateall()[1:]
+		buildbox = self.findbuildbox()
+		queue = counter - 1 - list(self.htmldict["boxinfo"]).index(buildbox) if buildbox else counter  # boxes left in this cycle
+		return Summary(self.platform, buildbox, queue, failed, int(cycletime.total_seconds()) if cycletime else 0, counter, self.timestamp)
+
+	def expires(self):  # estimated end of the current build as timestamp (all ETAs are outdated afterwards), None if no build is running
+		buildbox = self.findbuildbox()
+		if buildbox:
+			return self.timestamp + self.evaluateall()[0][buildbox][0].total_seconds()
+
+	def evaluate(self, box=None):  # evaluate box data
+		if not self.htmldict:
+			return None, 0, None, 0, 0
+		buildbox = self.findbuildbox()
+		boxinfo = self.htmldict["boxinfo"]
+		nextbuild = timedelta()
+		cycletime = timedelta()
+		boxesahead = 0
+		boxcounter = 0
+		collect = True
+		foundbox = False
+		failed = 0
+		for boxname in boxinfo:
+			timestr = boxinfo[boxname]["BuildTime"].split(",")  # handle those exceptions: e.g. '-1 day, 23:59:24'
+			time = timestr[0].strip().split(":") if len(timestr) == 1 else timestr[1].strip().split(":")
+			if len(time) < 3:
+				time = [0, 0, 0]
+			if boxname == buildbox:  # currently built box
+				collect = True
+				if not foundbox:
+					nextbuild = timedelta()  # reset
+					boxesahead = 0
+			else:
+				h, m, s = time
+				cycletime += timedelta(hours=int(h), minutes=int(m), seconds=int(s))
+			if collect and len(time) > 1:
+				h, m, s = time
+				nextbuild += timedelta(hours=int(h), minutes=int(m), seconds=int(s))
+				boxesahead += 1
+			if boxname == box:  # own box name
+				foundbox = True
+				collect = False
+			if "Failed" in boxinfo[boxname]["BuildStatus"]:
+				failed += 1
+			boxcounter += 1
+		if box is not None and not foundbox:
+			return timedelta(), 0, cycletime, boxcounter, failed
+		return nextbuild, boxesahead - 1, cycletime, boxcounter, failed
+
+	def evaluateall(self):  # evaluates all boxes in a single traversal, returns ({boxname: (nextbuild, boxesahead)}, cycletime, boxcounter, failed)
+		if not self.htmldict:
+			return {}, None, 0, 0
+		boxinfo = self.htmldict["boxinfo"]
+		buildbox = None
+		boxnames, prefix = [], []  # prefix sums of build times
+		total = timedelta()
+		failed = 0
+		for boxname, boxdata in boxinfo.items():
+			timestr = boxdata["BuildTime"].split(",")  # handle those exceptions: e.g. '-1 day, 23:59:24'
+			time = timestr[0].strip().split(":") if len(timestr) == 1 else timestr[1].strip().split(":")
+			h, m, s = time if len(time) == 3 else (0, 0, 0)
+			total += timedelta(hours=int(h), minutes=int(m), seconds=int(s))
+			boxnames.append(boxname)
+			prefix.append(total)
+			if buildbox is None and "Building" in boxdata["BuildStatus"]:
+				buildbox = len(boxnames) - 1
+			if "Failed" in boxdata["BuildStatus"]:
+				failed += 1
+		count = len(boxnames)
+		etas = {}
+		if buildbox is None:  # server paused: queue is counted from the top
+			for idx, boxname in enumerate(boxnames):
+				etas[boxname] = (prefix[idx], idx)
+			return etas, total, count, failed
+		beforebuild = prefix[buildbox - 1] if buildbox else timedelta()
+		for idx, boxname in enumerate(boxnames):
+			if idx >= buildbox:  # box comes after the currently built box in this cycle
+				etas[boxname] = (prefix[idx] - beforebuild, idx - buildbox)
+			else:  # box will be built in the next cycle
+				etas[boxname] = (prefix[idx] + total - beforebuild, idx + count - buildbox)
+		return etas, total - (prefix[buildbox] - beforebuild), count, failed
+
+
+FleetEntry = namedtuple("FleetEntry", ["boxname", "platform", "buildstatus", "nextbuild", "boxesahead", "building", "error"])  # one box of a fleet evaluation
+Summary = namedtuple("Summary", ["platform", "buildbox", "queue", "failed", "cycletime", "boxcounter", "timestamp"])  # aggregate figures of a platform, cycletime in seconds
+Validator = namedtuple("Validator", ["etag", "lastmodified", "digest", "size", "fetchtime", "parsetime", "htmldict"])  # revalidation data of a platform page
+
+
+def sizeof(obj, seen=None):  # deep size in bytes of nested dicts, lists, tuples, sets and strings (shared objects are counted once)
+	seen = set() if seen is None else seen
+	if id(obj) in seen:
+		return 0
+	seen.add(id(obj))
+	size = getsizeof(obj)
+	if isinstance(obj, dict):
+		size += sum(sizeof(key, seen) + sizeof(value, seen) for key, value in obj.items())
+	elif isinstance(obj, (list, tuple, set, frozenset)):
+		size += sum(sizeof(item, seen) for item in obj)
+	return size
+
+
+class SizedCache:  # mapping with a byte budget: the least recently used entries are evicted first, the newest entry is always kept (not thread-safe)
+	def __init__(self, maxbytes=0):
+		self.maxbytes = maxbytes  # 0 = unlimited
+		self.entries = OrderedDict()  # {key: (value, nbytes)} in order of use
+		self.nbytes = 0
+
+	def __contains__(self, key):
+		return key in self.entries
+
+	def __len__(self):
+		return len(self.entries)
+
+	def __iter__(self):
+		return iter(list(self.entries))
+
+	def items(self):
+		return [(key, entry[0]) for key, entry in self.entries.items()]
+
+	def get(self, key, default=None):  # marks the entry as recently used
+		entry = self.entries.get(key)
+		if entry is None:
+			return default
+		self.entries.move_to_end(key)
+		return entry[0]
+
+	def sizeof(self, key):  # bytes of the entry, 0 if unknown
+		entry = self.entries.get(key)
+		return entry[1] if entry else 0
+
+	def put(self, key, value, nbytes=0):  # returns [(key, value)] of the evicted entries
+		self.pop(key)
+		self.entries[key] = (value, nbytes)
+		self.nbytes += nbytes
+		return self.shrink()
+
+	def pop(self, key, default=None):
+		entry = self.entries.pop(key, None)
+		if entry is None:
+			return default
+		self.nbytes -= entry[1]
+		return entry[0]
+
+	def shrink(self, maxbytes=None):  # applies a new budget (if given), returns [(key, value)] of the evicted entries
+		if maxbytes is not None:
+			self.maxbytes = maxbytes
+		evicted = []
+		while self.maxbytes and self.nbytes > self.maxbytes and len(self.entries) > 1:
+			key, (value, nbytes) = self.entries.popitem(last=False)
+			self.nbytes -= nbytes
+			evicted.append((key, value))
+		return evicted
+
+	def clear(self):
+		self.entries.clear()
+		self.nbytes = 0
+
+	def usage(self):  # (number of entries, bytes)
+		return len(self.entries), self.nbytes
+
+
+class BoxIndex:  # n-gram index of box and OEM names over all loaded platforms, updated incrementally platform by platform
+	GRAMSIZE = 3  # all substrings up to this length are indexed, longer search texts are intersected from their n-grams
+	ENTRYSIZE = 64  # approximate bytes of a key in a set or dict of the index, including its share of the n-gram strings
+
 	def __init__(self):
+		self.grams = {}  # {ngram: set of (platform, boxname)}
+		self.prefixes = {}  # {prefix up to GRAMSIZE: set of (platform, boxname)}, the candidates of short search texts which are ranked first
+		self.names = {}  # {(platform, boxname): (boxname, oemname)} in lower case
+		self.platkeys = {}  # {platform: set of (platform, boxname)}
+		self.results = {}  # {platform: (BuildResult, evaluation of all boxes, buildbox)}
+		self.order = None  # all keys sorted by boxname and platform (rebuilt on demand after changes): the ranking of short search texts' other matches
+		self.lock = Lock()
+
+	def ngrams(self, text):
+		return {text[idx:idx + size] for size in range(1, self.GRAMSIZE + 1) for idx in range(len(text) - size + 1)}
+
+	def prefixgrams(self, text):
+		return {text[:size] for size in range(1, min(len(text), self.GRAMSIZE) + 1)}
+
+	def update(self, result):  # (re)indexes the platform of a BuildResult, unchanged pages are skipped
+		if not result.htmldict:
+			return
+		with self.lock:
+			previous = self.results.get(result.platform)
+			if previous and previous[0].htmldict is result.htmldict:  # revalidated but not changed
+				self.results[result.platform] = (result,) + previous[1:]
+				return
+		names = {(result.platform, boxname): (boxname.lower(), boxdata["OemName"].lower()) for boxname, boxdata in result.htmldict["boxinfo"].items()}
+		evaluation = result.evaluateall()  # ETAs of all boxes in one pass
+		buildbox = result.findbuildbox()
+		with self.lock:
+			self.unindex(result.platform)
+			for key, (boxname, oemname) in names.items():
+				for gram in self.ngrams(boxname) | self.ngrams(oemname):
+					self.grams.setdefault(gram, set()).add(key)
+				for gram in self.prefixgrams(boxname) | self.prefixgrams(oemname):
+					self.prefixes.setdefault(gram, set()).add(key)
+			self.names.update(names)
+			self.platkeys[result.platform] = set(names)
+			self.results[result.platform] = (result, evaluation, buildbox)
+
+	def remove(self, platform):  # drops a platform from the index (e.g. evicted from the platform cache)
+		with self.lock:
+			self.results.pop(platform, None)
+			self.unindex(platform)
+
+	def unindex(self, platform):  # drops the boxes of a platform from the n-grams and prefixes, must be called with lock held
+		for key in self.platkeys.pop(platform, ()):
+			boxname, oemname = self.names.pop(key)
+			for index, grams in ((self.grams, self.ngrams(boxname) | self.ngrams(oemname)), (self.prefixes, self.prefixgrams(boxname) | self.prefixgrams(oemname))):
+				for gram in grams:
+					keys = index.get(gram)
+					if keys:
+						keys.discard(key)
+						if not keys:
+							del index[gram]
+		self.order = None
+
+	def estimate(self, htmldict):  # approximate bytes the index needs for the boxes of a page: names and their n-gram and prefix memberships
+		nbytes = 0
+		for boxname, boxdata in htmldict["boxinfo"].items():
+			names = (boxname.lower(), boxdata["OemName"].lower())
+			memberships = len(self.ngrams(names[0]) | self.ngrams(names[1])) + len(self.prefixgrams(names[0]) | self.prefixgrams(names[1]))
+			nbytes += sizeof(names) + 3 * self.ENTRYSIZE + self.ENTRYSIZE * memberships
+		return nbytes
+
+	def memoryuse(self):  # (number of indexed boxes, bytes)
+		with self.lock:
+			return len(self.names), sizeof((self.grams, self.prefixes, self.names, self.platkeys, self.order)) + sum(getsizeof(entry) for entry in self.results.values())
+
+	def platforms(self):  # list of indexed platforms
+		with self.lock:
+			return list(self.results)
+
+	def search(self, text, limit=None):  # returns [(platform, boxname)] whose box or OEM name contains text: exact matches first, then prefixes
+		text = text.strip().lower()
+		if not text:
+			return []
+		with self.lock:
+			names = self.names
+
+			def rank(key):
+				return (0 if text in names[key] else 1 if names[key][0].startswith(text) or names[key][1].startswith(text) else 2, key[1], key[0])
+			if len(text) < self.GRAMSIZE:  # short texts match most boxes: only the prefix matches are ranked, the others follow in pre-ranked order
+				keys = self.grams.get(text, set())
+				first = self.prefixes.get(text, set())
+				ranked = nsmallest(limit, first, key=rank) if limit else sorted(first, key=rank)
+				if self.order is None:
+					self.order = sorted(names, key=lambda key: (key[1], key[0]))
+				others = (key for key in self.order if key in keys and key not in first)
+				return ranked + list(islice(others, limit - len(ranked) if limit else None))
+			if len(text) == self.GRAMSIZE:
+				keys = set(self.grams.get(text, ()))
+			else:
+				candidates = sorted((self.grams.get(text[idx:idx + self.GRAMSIZE], set()) for idx in range(len(text) - self.GRAMSIZE + 1)), key=len)
+				keys = {key for key in candidates[0].intersection(*candidates[1:]) if text in self.names[key][0] or text in self.names[key][1]}
+			return nsmallest(limit, keys, key=rank) if limit else sorted(keys, key=rank)
+
+	def lookup(self, platform, boxname):  # returns (BuildResult, nextbuild, boxesahead) of an indexed box, nextbuild is None while the server is paused
+		with self.lock:
+			entry = self.results.get(platform)
+		if entry is None:  # platform was dropped meanwhile (e.g. evicted in low-memory mode)
+			return None
+		result, evaluation, buildbox = entry
+		nextbuild, boxesahead = evaluation[0].get(boxname, (None, 0))
+		return result, nextbuild if buildbox else None, boxesahead
+
+
+class Executor:  # dedicated bounded worker pool with priority classes and a global requests-per-second budget
+	def __init__(self, maxworkers=4, rate=10.0, burst=20):
+		self.maxworkers = maxworkers
+		self.rate = rate  # server requests per second (0 = unlimited)
+		self.burst = burst  # requests which may be sent at once after a quiet period
+		self.tokens = burst
+		self.refilled = perf_counter()
+		self.queue = []  # heap of (priority, sequence, enqueued, func, args, kwargs)
+		self.sequence = 0  # keeps the order of submission within a priority class
+		self.workers = 0
+		self.running = 0
+		self.lock = Lock()
+		self.wakeup = Condition(self.lock)
+		self.budgetlock = Lock()
+		self.stats = {"submitted": dict.fromkeys(PRIORITIES, 0), "completed": 0, "failed": 0, "maxdepth": 0, "waittime": 0.0, "requests": 0, "throttletime": 0.0}
+
+	def submit(self, priority, func, *args, **kwargs):  # runs 'func(*args, **kwargs)' on a worker thread, 'priority' is one of PRIORITIES
+		with self.lock:
+			heappush(self.queue, (PRIORITIES.index(priority), self.sequence, perf_counter(), func, args, kwargs))
+			self.sequence += 1
+			self.stats["submitted"][priority] += 1
+			self.stats["maxdepth"] = max(self.stats["maxdepth"], len(self.queue))
+			if self.workers < self.maxworkers and self.running + len(self.queue) > self.workers:  # workers are started on demand and kept
+				self.workers += 1
+				Thread(target=self.worker, daemon=True).start()
+			self.wakeup.notify()
+
+	def worker(self):
+		while True:
+			with self.lock:
+				while not self.queue:
+					self.wakeup.wait()
+				_, _, enqueued, func, args, kwargs = heappop(self.queue)  # (priority, sequence, ...) only order the heap
+				self.running += 1
+				self.stats["waittime"] += perf_counter() - enqueued
+			failed = 0
+			try:
+				func(*args, **kwargs)
+			except Exception as err:
+				print(f"[{MODULE_NAME}] ERROR in module 'Executor': task '{getattr(func, '__name__', func)}' failed: {str(err)}")
+				failed = 1
+			with self.lock:
+				self.running -= 1
+				self.stats["completed"] += 1
+				self.stats["failed"] += failed
+
+	def acquire(self):  # blocks until the requests-per-second budget allows one more server request (token bucket)
+		with self.budgetlock:
+			self.stats["requests"] += 1
+			if not self.rate:
+				return
+			now = perf_counter()
+			self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+			self.refilled = now
+			self.tokens -= 1  # may become negative: the request reserves the next free slot
+			delay = -self.tokens / self.rate if self.tokens < 0 else 0
+			self.stats["throttletime"] += delay
+		if delay:
+			sleep(delay)
+
+	def queuedepth(self):  # returns {priority: number of waiting tasks}
+		with self.lock:
+			depth = dict.fromkeys(PRIORITIES, 0)
+			for task in self.queue:
+				depth[PRIORITIES[task[0]]] += 1
+			return depth
+
+	def getstats(self):  # queue depth and load statistics
+		depth = self.queuedepth()
+		with self.lock:
+			stats = dict(self.stats, submitted=self.stats["submitted"].copy())
+			running, workers = self.running, self.workers
+		submitted = sum(stats["submitted"].values())
+		return (f"{submitted} tasks ({', '.join(f'{key} {value}' for key, value in stats['submitted'].items())}), {stats['failed']} failed, "
+				f"queued {sum(depth.values())} (max {stats['maxdepth']}), running {running}/{workers}, "
+				f"mean wait {stats['waittime'] * 1000 / max(stats['completed'] + running, 1):.1f} ms, "
+				f"{stats['requests']} server requests, throttled {stats['throttletime'] * 1000:.1f} ms")
+
+
+class Buildstatus:
+	def __init__(self, contenturl=None, cachefile=PLATFORMCACHE):
+		self.contenturl = contenturl or CONTENTURL  # the platform urls are taken from this file
+		self.cachefile = cachefile  # last known platform list for 'quickstart' (None = not cached)
+		self.summaryfile = join(dirname(cachefile), "summaries.json") if cachefile else None  # last known summaries of all platforms
 		self.url = None
 		self.error = None
 		self.htmldict = None
@@ -32,10 +412,18 @@ class Buildstatus:
 		self.archlist = []  # list of available architectures with extension '_oldest' or '_latest'
 		self.platlist = []  # list of available platforms
 		self.platdict = {}  # dict of available platforms and relating urls
+		self.platcache = SizedCache()  # recently fetched platforms: {platform: BuildResult}, bytes of the parsed page and its index entries (see 'setbudget')
+		self.validators = {}  # dict of revalidation data of platform pages: {url: Validator}
+		self.summaries = None  # dict of summaries of all platforms fetched so far: {platform: Summary} (loaded on first use)
+		self.stats = {"requests": 0, "notmodified": 0, "unchanged": 0, "bytesreceived": 0, "bytessaved": 0, "parsetime": 0.0, "parsesaved": 0.0}
+		self.cachelock = Lock()
+		self.boxindex = BoxIndex()  # all fetched and prefetched platforms are searchable by box and OEM name
+		self.executor = None  # 'Executor' for background fetches (created on first use), its budget applies to all page requests then
 
 	def start(self):  # loads json-platformdata from build server
+		from requests import get, exceptions
 		try:
-			response = get("http://api.mynonpublic.com/content.json", timeout=(3.05, 6))
+			response = get(self.contenturl, timeout=(3.05, 6))
 			response.raise_for_status()
 		except exceptions.RequestException as err:
 			self.error = f"[{MODULE_NAME}] ERROR in module 'start': '{str(err)}"
@@ -43,49 +431,308 @@ class Buildstatus:
 		try:
 			dictdata = loads(response.text)
 			if dictdata:
-				self.platdict = dictdata
-				self.platlist = sorted(self.platdict["versionurls"].keys())
-				helplist = [x.split(" ")[0].lower() for x in self.platlist]
-				archlist = []
-				for arch in helplist:  # separate dupes in platforms in "latest" and "oldest"
-					if helplist.count(arch) > 1:
-						release = "oldest" if f"{arch}_latest" in archlist else "latest"
-					else:
-						release = "latest"
-					archlist.append(f"{arch.lower()}_{release}")
-				self.archlist = sorted(set(archlist))
+				self.setplatforms(dictdata)
+				self.writeplatforms(dictdata)
 				return dictdata
 			self.error = f"[{MODULE_NAME}] ERROR in module 'start': server access failed."
 		except Exception as err:
 			self.error = f"[{MODULE_NAME}] ERROR in module 'start': invalid json data from server. {str(err)}"
 		return {}
 
+	def quickstart(self, platform=None, arch=None, url=None):  # single round trip: the version buttons of a known or cached platform page supply the platform list
+		if url is None:
+			cached = self.readplatforms()
+			if cached:
+				self.setplatforms(cached)
+				if platform not in self.platlist:
+					platform = self.getplatform(arch) if arch else None
+					platform = platform or self.platlist[0]
+				url = self.platdict["versionurls"][platform]["url"]
+			else:
+				url = PLATFORMURL
+		if url:
+			htmldict, error = self.revalidate(url)
+			if htmldict and htmldict["versionurls"]:
+				versionurls = self.platdict.get("versionurls", {})
+				self.setplatforms(dict(self.platdict, versionurls={version: dict(versionurls.get(version, {}), url=item["url"]) for version, item in htmldict["versionurls"].items()}))
+				platform = next((version for version, item in htmldict["versionurls"].items() if item["url"] == url), None)
+				if platform:  # the page itself: the following 'fetch' of this platform needs no further request
+					self.store(BuildResult(platform, htmldict, None, time()))
+				self.error = None
+				if self.executor:  # within the requests budget of the plugin's background work
+					self.executor.submit("prefetch", self.checkcontent)
+				else:
+					Thread(target=self.checkcontent, daemon=True).start()
+				return self.platdict
+			print(f"[{MODULE_NAME}] platform page unusable for bootstrap, loading platform list: {error or 'no version buttons'}")
+		return self.start()  # no cached or known platform page: classic bootstrap via 'content.json'
+
+	def checkcontent(self):  # background check of 'content.json' after 'quickstart': it is authoritative (e.g. for platforms without version button)
+		from requests import get, exceptions
+		self.throttle()
+		try:
+			response = get(self.contenturl, timeout=(3.05, 6))
+			response.raise_for_status()
+			dictdata = loads(response.text)
+		except (exceptions.RequestException, ValueError) as err:
+			print(f"[{MODULE_NAME}] ERROR in module 'checkcontent': '{str(err)}")
+			return
+		if dictdata and dictdata.get("versionurls"):
+			if dictdata["versionurls"] != self.platdict.get("versionurls"):
+				self.setplatforms(dictdata)
+			self.writeplatforms(dictdata)
+
+	def setplatforms(self, dictdata):  # all lists are replaced at once, so readers on other threads always see consistent lists
+		platlist = sorted(dictdata["versionurls"].keys())
+		helplist = [x.split(" ")[0].lower() for x in platlist]
+		archlist = []
+		for arch in helplist:  # separate dupes in platforms in "latest" and "oldest"
+			if helplist.count(arch) > 1:
+				release = "oldest" if f"{arch}_latest" in archlist else "latest"
+			else:
+				release = "latest"
+			archlist.append(f"{arch.lower()}_{release}")
+		self.platdict, self.platlist, self.archlist = dictdata, platlist, sorted(set(archlist))
+
+	def readplatforms(self):  # last known platform list or None
+		if self.cachefile:
+			try:
+				with open(self.cachefile) as file:
+					dictdata = loads(file.read())
+				if dictdata.get("versionurls"):
+					return dictdata
+			except (OSError, ValueError, AttributeError):
+				pass
+
+	def writeplatforms(self, dictdata):  # only if the platform list has changed
+		if self.cachefile and dictdata != self.readplatforms():
+			self.writecache(self.cachefile, dictdata)
+
+	def writecache(self, filename, dictdata):  # atomic: a concurrent reader never sees a partially written file
+		try:
+			makedirs(dirname(filename), exist_ok=True)
+			tmpfile = f"{filename}.{getpid()}.tmp"
+			with open(tmpfile, "w") as file:
+				dump(dictdata, file)
+			replace(tmpfile, filename)
+		except OSError as err:
+			print(f"[{MODULE_NAME}] ERROR in module 'writecache': '{str(err)}")
+
 	def stop(self):
 		self.callback = None
 		self.error = None
 
 	def getpage(self):  # loads html-imagedata from build server
-		self.error = None
-		if self.url:
-			if self.callback:
-				print(f"[{MODULE_NAME}] accessing buildservers for data...")
-			try:
-				response = get(self.url, timeout=(3.05, 6))
-				response.raise_for_status()
-			except exceptions.RequestException as err:
-				self.error = f"[{MODULE_NAME}] ERROR in module 'getpage': '{str(err)}"
-				return
-			try:
+		if self.url and self.callback:
+			print(f"[{MODULE_NAME}] accessing buildservers for data...")
+		htmldata, self.error = self.fetchpage(self.url)
+		return htmldata
+
+	def fetchpage(self, url):  # loads html-imagedata from build server, returns (htmldata, error) without touching any state
+		if not url:
+			return None, f"[{MODULE_NAME}] ERROR in module 'getpage': missing url"
+		from requests import get, exceptions
+		self.throttle()
+		try:
+			response = get(url, timeout=(3.05, 6))
+			response.raise_for_status()
+		except exceptions.RequestException as err:
+			return None, f"[{MODULE_NAME}] ERROR in module 'getpage': '{str(err)}"
+		try:
+			htmldata = response.text
+			if htmldata:
+				return htmldata, None
+			return None, f"[{MODULE_NAME}] ERROR in module 'getpage': server access failed."
+		except Exception as err:
+			return None, f"[{MODULE_NAME}] ERROR in module 'getpage': invalid data from server {str(err)}"
+
+	def fetch(self, platform, maxage=CACHETIME):  # reentrant: loads imagesdata of platform and returns a BuildResult
+		result = self.getcached(platform, maxage)
+		if result:  # fresh (pre)fetched data available: no need to access the build server
+			return result
+		if platform not in self.platlist:
+			return BuildResult(platform, None, f"[{MODULE_NAME}] ERROR in module 'fetch': invalid platform: {platform})", time())
+		htmldict, error = self.revalidate(self.platdict["versionurls"][platform]["url"])
+		if htmldict:
+			result = BuildResult(platform, htmldict, None, time())  # complete dict of all platform boxes
+			self.store(result)
+			return result
+		return BuildResult(platform, None, error or f"[{MODULE_NAME}] ERROR in module 'fetch': htmldata is None.", time())
+
+	def store(self, result):  # caches a fresh BuildResult with its index entries and summary, both are evaluated again only if the page has changed
+		with self.cachelock:
+			previous = self.platcache.get(result.platform)
+			unchanged = previous and previous.htmldict is result.htmldict  # unchanged page (see 'revalidate')
+			nbytes = self.platcache.sizeof(result.platform) if unchanged else sizeof(result.htmldict) + self.boxindex.estimate(result.htmldict)
+			evicted = self.platcache.put(result.platform, result, nbytes)
+			summaries = self.loadsummaries()
+			summary = summaries.get(result.platform)
+			summaries[result.platform] = summary._replace(timestamp=result.timestamp) if summary and unchanged else result.summarize()
+		self.boxindex.update(result)
+		self.evict(evicted)
+
+	def evict(self, evicted):  # releases everything kept for the evicted platforms: index entries and revalidation data hold the same parsed page
+		for platform, result in evicted:
+			url = self.platdict.get("versionurls", {}).get(platform, {}).get("url")
+			with self.cachelock:
+				if platform in self.platcache:  # stored again meanwhile by another thread
+					continue
+				self.validators.pop(url, None)
+				self.boxindex.remove(platform)
+			if self.htmldict is result.htmldict:
+				self.htmldict = None
+
+	def setbudget(self, maxbytes):  # bytes the parsed pages of all cached platforms and their index entries may use (0 = unlimited), the latest platform is always kept
+		with self.cachelock:
+			evicted = self.platcache.shrink(maxbytes)
+		self.evict(evicted)
+
+	def release(self):  # frees all cached pages, their index and revalidation data (e.g. in standby), the summaries are saved before
+		self.writesummaries()
+		with self.cachelock:
+			evicted = self.platcache.items()
+			self.platcache.clear()
+			self.validators.clear()
+			self.summaries = None  # reloaded from file on demand
+		self.evict(evicted)
+		self.htmldict = None
+
+	def getmemory(self):  # memory use of all caches: {name: (number of entries, bytes)}, 'platforms' is the budgeted estimate including the index entries
+		with self.cachelock:
+			memory = {"platforms": self.platcache.usage(),
+					"validators": (len(self.validators), sum(getsizeof(validator) for validator in self.validators.values())),  # the parsed pages are counted in 'platforms'
+					"summaries": (len(self.summaries or {}), sizeof(self.summaries) if self.summaries else 0)}
+		memory["boxindex"] = self.boxindex.memoryuse()
+		return memory
+
+	def loadsummaries(self):  # must be called with lock held: summaries of the last session serve until the platforms are fetched again
+		if self.summaries is None:
+			self.summaries = {}
+			if self.summaryfile:
+				try:
+					with open(self.summaryfile) as file:
+						self.summaries = {platform: Summary(*fields) for platform, fields in loads(file.read()).items()}
+				except (OSError, ValueError, TypeError, AttributeError):
+					pass
+		return self.summaries
+
+	def getsummaries(self, platforms=None):  # summaries of platforms (default: all) from memory or file, without any server access: {platform: Summary}
+		with self.cachelock:
+			summaries = self.loadsummaries()
+			return {platform: summaries[platform] for platform in platforms or self.platlist if platform in summaries}
+
+	def writesummaries(self):
+		if self.summaryfile:
+			with self.cachelock:
+				dictdata = {platform: list(summary) for platform, summary in self.loadsummaries().items()}
+			self.writecache(self.summaryfile, dictdata)
+
+	def refreshsummaries(self, maxage=CACHETIME, maxworkers=8):  # fetches platforms with outdated summaries only (in parallel), returns the summaries of all platforms
+		summaries = self.getsummaries()
+		outdated = [platform for platform in self.platlist if platform not in summaries or time() - summaries[platform].timestamp >= maxage]
+		if outdated:
+			with ThreadPoolExecutor(max_workers=min(maxworkers, len(outdated))) as executor:
+				for result in executor.map(self.fetch, outdated):
+					if result.error:
+						print(result.error.replace("'fetch'", "'refreshsummaries'"))
+			self.writesummaries()
+		return self.getsummaries()
+
+	def revalidate(self, url):  # loads page conditionally and parses it only if it has changed, returns (htmldict, error)
+		from requests import get, exceptions
+		with self.cachelock:
+			previous = self.validators.get(url)
+		headers = {"Accept-Encoding": "gzip"}
+		if previous and previous.etag:
+			headers["If-None-Match"] = previous.etag
+		if previous and previous.lastmodified:
+			headers["If-Modified-Since"] = previous.lastmodified
+		self.throttle()
+		try:
+			fetchstart = perf_counter()
+			response = get(url, headers=headers, timeout=(3.05, 6))
+			response.raise_for_status()
+			fetchtime = perf_counter() - fetchstart
+		except exceptions.RequestException as err:
+			return None, f"[{MODULE_NAME}] ERROR in module 'revalidate': '{str(err)}"
+		etag, lastmodified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+		if response.status_code == 304 and previous:  # not modified: server supports validators
+			self.addstats(requests=1, notmodified=1, bytessaved=previous.size, parsesaved=previous.parsetime)
+			validator = previous._replace(etag=etag or previous.etag, lastmodified=lastmodified or previous.lastmodified, fetchtime=fetchtime)
+		else:
+			content = response.content
+			if not content:
+				return None, f"[{MODULE_NAME}] ERROR in module 'revalidate': server access failed."
+			received = int(response.headers.get("Content-Length", len(content))) if response.headers.get("Content-Encoding") == "gzip" else len(content)
+			digest = sha1(content).hexdigest()
+			if previous and previous.digest == digest:  # unchanged: server doesn't support validators
+				self.addstats(requests=1, unchanged=1, bytesreceived=received, bytessaved=len(content) - received, parsesaved=previous.parsetime)
+				validator = previous._replace(etag=etag, lastmodified=lastmodified, fetchtime=fetchtime)
+			else:
+				size = len(content)
 				htmldata = response.text
-				if htmldata:
-					return htmldata
-				self.error = f"[{MODULE_NAME}] ERROR in module 'getpage': server access failed."
-			except Exception as err:
-				self.error = f"[{MODULE_NAME}] ERROR in module 'getpage': invalid data from server {str(err)}"
+				response = content = None  # the raw page is released before parsing: only the parsed dict will be kept
+				try:
+					parsestart = perf_counter()
+					htmldict = self.htmlparse(htmldata)
+					parsetime = perf_counter() - parsestart
+				except Exception as err:
+					return None, f"[{MODULE_NAME}] ERROR in module 'revalidate': invalid data from server {str(err)}"
+				finally:
+					htmldata = None
+				self.addstats(requests=1, bytesreceived=received, bytessaved=size - received, parsetime=parsetime)
+				validator = Validator(etag, lastmodified, digest, size, fetchtime, parsetime, htmldict)
+		with self.cachelock:
+			self.validators[url] = validator
+		return validator.htmldict, None
+
+	def throttle(self):  # waits for the requests-per-second budget of the executor (if any)
+		if self.executor:
+			self.executor.acquire()
+
+	def getexecutor(self):
+		if self.executor is None:
+			self.executor = Executor()
+		return self.executor
+
+	def addstats(self, **kwargs):
+		with self.cachelock:
+			for key, value in kwargs.items():
+				self.stats[key] += value
+
+	def getstats(self):  # savings of conditional revalidation and parse skipping
+		with self.cachelock:
+			stats = self.stats.copy()
+		return (f"{stats['requests']} page requests ({stats['notmodified']} not modified, {stats['unchanged']} unchanged), "
+				f"{stats['bytesreceived']} bytes received, {stats['bytessaved']} bytes saved, "
+				f"parse time {stats['parsetime'] * 1000:.1f} ms, parse time saved {stats['parsesaved'] * 1000:.1f} ms")
+
+	def fetchasync(self, platform, callback, maxage=CACHETIME, cancelled=None, priority="list"):  # reentrant: calls 'callback(BuildResult)' from a worker thread
+		result = self.getcached(platform, maxage)
+		if result:
+			callback(result)
 		else:
-			self.error = f"[{MODULE_NAME}] ERROR in module 'getpage': missing url"
+			self.getexecutor().submit(priority, self.fetchworker, platform, callback, maxage, cancelled)
+
+	def fetchworker(self, platform, callback, maxage, cancelled):
+		if cancelled and cancelled():  # request was superseded while waiting for a free thread: abort before any download
+			return
+		result = self.fetch(platform, maxage)
+		if not (cancelled and cancelled()):  # superseded requests are dropped
+			callback(result)
 
-	def getbuildinfos(self, platform, callback=None):  # loads imagesdata from build server
+	def getcached(self, platform, maxage=CACHETIME):  # get recently fetched BuildResult of platform (if still fresh)
+		with self.cachelock:
+			result = self.platcache.get(platform)
+		if result and time() - result.timestamp < maxage:
+			return result
+
+	def prefetch(self, platform):  # loads imagesdata of platform in background without touching the current state
+		result = self.fetch(platform)
+		if result.error:
+			print(result.error.replace("'fetch'", "'prefetch'"))
+
+	def getbuildinfos(self, platform, callback=None):  # loads imagesdata from build server (wrapper for 'fetch')
 		self.callback = callback
 		self.error = None
 		if platform in self.platlist:
@@ -94,10 +741,16 @@ class Buildstatus:
 			self.url = None
 			self.error = f"[{MODULE_NAME}] ERROR in module 'getbuildinfos': invalid platform: {platform})"
 			return {}
+		result = self.getcached(platform)
+		if result:  # fresh (pre)fetched data available: no need to access the build server
+			self.htmldict = result.htmldict
+			if callback:
+				callback(result.htmldict)
+			return result.htmldict
 		if callback:
-			callInThread(self.createdict, callback)
+			self.getexecutor().submit("list", self.createdict, callback, platform)
 		else:
-			return self.createdict()
+			return self.createdict(platform=platform)
 
 	def getplatform(self, currarch):  # get platform from architecture
 		archparts = currarch.split("_")
@@ -113,12 +766,16 @@ class Buildstatus:
 				platform = hitlist[-1] if archparts[1] == "latest" else hitlist[0]
 		return platform
 
-	def createdict(self, callback=None):  # coordinates 'get html-imagesdata & create imagesdict'
-		htmldata = self.getpage()
-		if htmldata:
-			self.htmldict = self.htmlparse(htmldata)  # complete dict of all platform boxes
+	def createdict(self, callback=None, platform=None):  # coordinates 'get html-imagesdata & create imagesdict' (wrapper for 'fetch')
+		if platform:
+			if callback:
+				print(f"[{MODULE_NAME}] accessing buildservers for data...")
+			result = self.fetch(platform)
+			self.htmldict, self.error = result.htmldict, result.error
 		else:
-			self.htmldict = None
+			htmldata = self.getpage()
+			self.htmldict = self.htmlparse(htmldata) if htmldata else None  # complete dict of all platform boxes
+		if self.htmldict is None and not self.error:
 			self.error = f"[{MODULE_NAME}] ERROR in module 'createdict': htmldata is None."
 		if callback:
 			if not self.error:
@@ -148,11 +805,11 @@ class Buildstatus:
 			boxname = boxinfo[1][1]
 			htmldict["boxinfo"][boxname] = {}  # boxname
 			htmldict["boxinfo"][boxname]["No"] = boxinfo[0][1]
-			htmldict["boxinfo"][boxname]["BoxNameClass"] = boxinfo[1][0]
-			htmldict["boxinfo"][boxname]["OemName"] = boxinfo[2][1]
-			htmldict["boxinfo"][boxname]["OemNameClass"] = boxinfo[2][0]
-			htmldict["boxinfo"][boxname]["BuildStatus"] = boxinfo[3][1]
-			htmldict["boxinfo"][boxname]["BuildClass"] = boxinfo[3][0]
+			htmldict["boxinfo"][boxname]["BoxNameClass"] = intern(boxinfo[1][0])  # repeated values share a single string
+			htmldict["boxinfo"][boxname]["OemName"] = intern(boxinfo[2][1])
+			htmldict["boxinfo"][boxname]["OemNameClass"] = intern(boxinfo[2][0])
+			htmldict["boxinfo"][boxname]["BuildStatus"] = intern(boxinfo[3][1])
+			htmldict["boxinfo"][boxname]["BuildClass"] = intern(boxinfo[3][0])
 			htmldict["boxinfo"][boxname]["StartBuild"] = dateset[0]
 			htmldict["boxinfo"][boxname]["StartFeedSync"] = dateset[1]
 			htmldict["boxinfo"][boxname]["EndBuild"] = dateset[2]
@@ -160,58 +817,42 @@ class Buildstatus:
 			htmldict["boxinfo"][boxname]["BuildTime"] = dateset[4]
 		return htmldict
 
-	def findbuildbox(self):  # find boxname current image is build for
+	def findbuildbox(self):  # find boxname current image is build for (wrapper for 'BuildResult.findbuildbox')
 		if self.htmldict is None:
 			self.error = f"[{MODULE_NAME}] ERROR in module 'findbuildbox': self.htmldict is None"
 			return
-		hit = None
-		boxinfo = self.htmldict["boxinfo"]
-		for boxname in list(boxinfo.keys()):
-			if "Building" in boxinfo[boxname]["BuildStatus"]:
-				hit = boxname
-				break
-		return hit
+		return BuildResult(None, self.htmldict, None, 0).findbuildbox()
 
-	def evaluate(self, box=None):  # evaluate box data
+	def evaluate(self, box=None):  # evaluate box data (wrapper for 'BuildResult.evaluate')
 		if self.htmldict is None:
 			self.error = f"[{MODULE_NAME}] ERROR in module 'evaluate': self.htmldict is None"
 			return None, 0, None, 0, 0
-		buildbox = self.findbuildbox()
-		boxinfo = self.htmldict["boxinfo"]
-		nextbuild = timedelta()
-		cycletime = timedelta()
-		boxesahead = 0
-		boxcounter = 0
-		collect = True
-		foundbox = False
-		failed = 0
-		for boxname in list(boxinfo.keys()):
-			timestr = boxinfo[boxname]["BuildTime"].split(",")  # handle those exceptions: e.g. '-1 day, 23:59:24'
-			time = timestr[0].strip().split(":") if len(timestr) == 1 else timestr[1].strip().split(":")
-			if len(time) < 3:
-				time = [0, 0, 0]
-			if boxname == buildbox:  # currently built box
-				collect = True
-				if not foundbox:
-					nextbuild = timedelta()  # reset
-					boxesahead = 0
-			else:
-				h, m, s = time
-				cycletime += timedelta(hours=int(h), minutes=int(m), seconds=int(s))
-			if collect and len(time) > 1:
-				h, m, s = time
-				nextbuild += timedelta(hours=int(h), minutes=int(m), seconds=int(s))
-				boxesahead += 1
-			if boxname == box:  # own box name
-				foundbox = True
-				collect = False
-			if "Failed" in boxinfo[boxname]["BuildStatus"]:
-				failed += 1
-			boxcounter += 1
-		if box is not None and not foundbox:
+		result = BuildResult(None, self.htmldict, None, 0)
+		if box is not None and not result.hasbox(box):
 			self.error = f"[{MODULE_NAME}] WARNING in module 'evaluate': Box not found in this platform. Try another platform."
-			return timedelta(), 0, cycletime, boxcounter, failed
-		return nextbuild, boxesahead - 1, cycletime, boxcounter, failed
+		return result.evaluate(box)
+
+	def evaluatefleet(self, boxes, maxworkers=8):  # evaluates many (boxname, platform) at once: each platform is fetched only once and in parallel
+		platforms = {}
+		for boxname, platform in boxes:
+			platforms.setdefault(platform, []).append(boxname)
+		report = []
+		if not platforms:
+			return report
+		with ThreadPoolExecutor(max_workers=min(maxworkers, len(platforms))) as executor:
+			results = executor.map(self.fetch, platforms)
+			for result in results:
+				etas = result.evaluateall()[0]
+				buildbox = result.findbuildbox()
+				for boxname in platforms[result.platform]:
+					if result.error:
+						report.append(FleetEntry(boxname, result.platform, None, None, None, False, result.error))
+					elif boxname in etas:
+						nextbuild, boxesahead = etas[boxname]
+						report.append(FleetEntry(boxname, result.platform, result.htmldict["boxinfo"][boxname]["BuildStatus"], nextbuild, boxesahead, bool(buildbox), None))
+					else:
+						report.append(FleetEntry(boxname, result.platform, None, None, None, False, f"[{MODULE_NAME}] WARNING in module 'evaluatefleet': Box not found in this platform."))
+		return sorted(report, key=lambda entry: (entry.nextbuild is None, entry.nextbuild or timedelta(), entry.boxname))
 
 	def strf_delta(self, td):  # converts deltatime-format in hours (e.g. '2 days, 01:00' in '49:00:00')
 		h, r = divmod(int(td.total_seconds()), 60 * 60)
@@ -220,20 +861,228 @@ class Buildstatus:
 		return f"{h}:{m}:{s}"
 
 
+class MetricsExporter:  # build status as Prometheus metrics: only platforms whose page has changed are evaluated and rendered again
+	METRICS = {"openatv_build_up": "1 if the build status of the platform could be loaded, else 0",  # all metrics are gauges
+			"openatv_build_boxes": "Number of boxes of the platform",
+			"openatv_build_failed_boxes": "Number of boxes whose last image build has failed",
+			"openatv_build_cycle_seconds": "Estimated duration of a complete build cycle",
+			"openatv_build_building": "1 for the box the image is currently built for",
+			"openatv_build_box_status": "1 for the current build status of each box",
+			"openatv_build_box_eta_seconds": "Estimated time until the next image of each box will be built",
+			"openatv_build_box_ahead": "Number of boxes which will be built before each box",
+			"openatv_build_fetch_seconds": "Duration of the last download (or revalidation) of the platform's page",
+			"openatv_build_parse_seconds": "Duration of the last parse of the platform's page",
+			"openatv_build_last_fetch_timestamp_seconds": "Time of the last successful download (or revalidation) of the platform's page"}
+
+	def __init__(self, BS, platforms):
+		self.BS = BS
+		self.platforms = platforms
+		self.samples = {}  # samples of each platform's page: {platform: (htmldict, {metric: [lines]})}
+		self.timings = {}  # samples of each platform's last fetch (also of fetches by others, e.g. 'quickstart'): {platform: {metric: [lines]}}
+		self.text = ""  # last complete rendering
+		self.lock = Lock()
+
+	def label(self, **labels):  # label set with escaped values
+		escaped = {key: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for key, value in labels.items()}
+		return ",".join(f'{key}="{value}"' for key, value in escaped.items())
+
+	def refresh(self, maxage=CACHETIME):  # downloads outdated platforms only (conditionally), returns the rendered metrics
+		for platform in self.platforms:
+			result = self.BS.fetch(platform, maxage)  # from cache if not outdated
+			self.timings[platform] = self.renderTimings(platform, result)
+			samples = self.samples.get(platform)
+			if samples is None or samples[0] is not result.htmldict:  # a page which was not modified keeps its parsed dict
+				self.samples[platform] = (result.htmldict, self.renderPlatform(platform, result))
+		lines = []
+		for metric, helptext in self.METRICS.items():
+			lines += [f"# HELP {metric} {helptext}", f"# TYPE {metric} gauge"]
+			for platform in self.platforms:
+				lines += self.timings.get(platform, {}).get(metric, []) + self.samples.get(platform, (None, {}))[1].get(metric, [])
+		text = "\n".join(lines) + "\n"
+		with self.lock:
+			self.text = text
+		return text
+
+	def renderTimings(self, platform, result):  # figures of the result and of its page's validator: no matter who fetched the page
+		label = self.label(platform=platform)
+		timings = {"openatv_build_up": [f"openatv_build_up{{{label}}} {1 if result.htmldict else 0}"]}
+		if result.htmldict:
+			url = self.BS.platdict["versionurls"][platform]["url"]
+			with self.BS.cachelock:
+				validator = self.BS.validators.get(url)
+			if validator:
+				timings["openatv_build_fetch_seconds"] = [f"openatv_build_fetch_seconds{{{label}}} {validator.fetchtime:.6f}"]
+				timings["openatv_build_parse_seconds"] = [f"openatv_build_parse_seconds{{{label}}} {validator.parsetime:.6f}"]
+			timings["openatv_build_last_fetch_timestamp_seconds"] = [f"openatv_build_last_fetch_timestamp_seconds{{{label}}} {result.timestamp:.3f}"]
+		return timings
+
+	def renderPlatform(self, platform, result):  # all boxes in a single evaluation
+		if not result.htmldict:
+			return {}
+		etas, cycletime, counter, failed = result.evaluateall()
+		buildbox = result.findbuildbox()
+		label = self.label(platform=platform)
+		samples = {"openatv_build_boxes": [f"openatv_build_boxes{{{label}}} {counter}"],
+				"openatv_build_failed_boxes": [f"openatv_build_failed_boxes{{{label}}} {failed}"],
+				"openatv_build_cycle_seconds": [f"openatv_build_cycle_seconds{{{label}}} {cycletime.total_seconds():.0f}"],
+				"openatv_build_building": [f"openatv_build_building{{{self.label(platform=platform, box=buildbox)}}} 1"] if buildbox else [],
+				"openatv_build_box_status": [], "openatv_build_box_eta_seconds": [], "openatv_build_box_ahead": []}
+		for boxname, boxdata in result.htmldict["boxinfo"].items():
+			boxlabel = self.label(platform=platform, box=boxname)
+			samples["openatv_build_box_status"].append(f"openatv_build_box_status{{{self.label(platform=platform, box=boxname, status=boxdata['BuildStatus'])}}} 1")
+			if buildbox:  # ETAs are unclear while the server is paused
+				nextbuild, boxesahead = etas[boxname]
+				samples["openatv_build_box_eta_seconds"].append(f"openatv_build_box_eta_seconds{{{boxlabel}}} {nextbuild.total_seconds():.0f}")
+				samples["openatv_build_box_ahead"].append(f"openatv_build_box_ahead{{{boxlabel}}} {boxesahead}")
+		return samples
+
+	def writeTextfile(self, filename):  # atomic: node-exporter never reads a partially written file, returns False on failure
+		with self.lock:
+			text = self.text
+		tmpfile = f"{filename}.{getpid()}.tmp"
+		try:
+			with open(tmpfile, "w") as file:
+				file.write(text)
+			replace(tmpfile, filename)
+		except OSError as err:
+			print(f"[{MODULE_NAME}] ERROR in module 'writeTextfile': '{str(err)}")
+			try:
+				remove(tmpfile)
+			except OSError:
+				pass
+			return False
+		return True
+
+	def serve(self, port=None, textfile=None, interval=CACHETIME):  # long-running: refreshes every interval, serves '/metrics' and/or rewrites the textfile
+		self.refresh(interval)
+		if port is not None:
+			from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+			exporter = self
+
+			class MetricsHandler(BaseHTTPRequestHandler):
+				def do_GET(self):
+					if self.path.split("?")[0] != "/metrics":
+						self.send_error(404)
+						return
+					with exporter.lock:
+						body = exporter.text.encode()
+					self.send_response(200)
+					self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+					self.send_header("Content-Length", str(len(body)))
+					self.end_headers()
+					self.wfile.write(body)
+
+				def log_message(self, format, *args):  # scrapes would flood the console
+					pass
+
+			try:
+				server = ThreadingHTTPServer(("", port), MetricsHandler)
+			except OSError as err:
+				print(f"[{MODULE_NAME}] ERROR in module 'serve': '{str(err)}")
+				return
+			Thread(target=server.serve_forever, daemon=True).start()
+			print(f"Serving metrics on http://localhost:{server.server_address[1]}/metrics (refreshed every {interval} seconds)")
+		while True:
+			if textfile:
+				self.writeTextfile(textfile)
+			sleep(interval)
+			self.refresh(interval)
+
+
+def iterboxes(htmldict, statusfilter=None):  # yields (boxname, boxdata), filters apply before any formatting
+	for boxname, boxdata in htmldict["boxinfo"].items():
+		if not statusfilter or any(status in boxdata["BuildStatus"] for status in statusfilter):  # substring test as for the failed counter
+			yield boxname, boxdata
+
+
+def export(htmldict, file, fmt="table", columns=None, statusfilter=None, platform=""):  # streams rows one by one to file, returns number of rows
+	columns = columns or list(COLUMNS)
+	counter, failed = 0, 0
+	if fmt == "csv":
+		writer = csvwriter(file)
+		writer.writerow(columns)
+		for counter, (boxname, boxdata) in enumerate(iterboxes(htmldict, statusfilter), 1):
+			writer.writerow([boxname if column == "BoxName" else boxdata[column] for column in columns])
+	elif fmt == "ndjson":
+		for counter, (boxname, boxdata) in enumerate(iterboxes(htmldict, statusfilter), 1):
+			file.write(f"{dumps({column: boxname if column == 'BoxName' else boxdata[column] for column in columns})}\n")
+	else:  # table
+		separator = f"+{'+'.join('-' * (COLUMNS[column][0] + 2) for column in columns)}+"
+		row = f"|{'|'.join(f' {{:{COLUMNS[column][1]}{COLUMNS[column][0]}}} ' for column in columns)}|"
+		width = len(separator) - 2
+		headline = htmldict["headline"].split(", ")
+		titles = [headline[list(COLUMNS).index(column)] if len(headline) == len(COLUMNS) else column for column in columns]  # the page's own column titles
+		header = f"|{'|'.join(f' {{:<{COLUMNS[column][0]}}} ' for column in columns)}|"
+		file.write(f"+{'-' * width}+\n| {htmldict['title'][:width - 1]:<{width - 1}}|\n{separator}\n{header.format(*titles)}\n{separator}\n")
+		for counter, (boxname, boxdata) in enumerate(iterboxes(htmldict, statusfilter), 1):
+			file.write(f"{row.format(*(boxname if column == 'BoxName' else boxdata[column] for column in columns))}\n")
+			if "Failed" in boxdata["BuildStatus"]:
+				failed += 1
+		parts = (f"current platform: {platform.upper()}", f"boxes found: {counter}", f"building errors found: {str(failed).rjust(3)}")
+		footer = f"{parts[0]:<50}{parts[1]:<48}{parts[2]}" if columns == list(COLUMNS) else ", ".join(parts)  # all columns: layout of the classic '-v' table
+		file.write(f"{separator}\n| {footer[:width - 1]:<{width - 1}}|\n+{'-' * width}+\n")
+	return counter
+
+
+def readfleet(filename):  # reads lines 'boxname[,architecture or platform]' from file, '#' starts a comment
+	fleet = []
+	with open(filename) as file:
+		for line in file:
+			line = line.split("#")[0].strip()
+			if line:
+				parts = [x.strip() for x in line.split(",", 1)]
+				fleet.append((parts[0].lower(), parts[1] if len(parts) > 1 else None))
+	return fleet
+
+
+def printfleet(BS, report):  # consolidated fleet report sorted by ETA
+	separator = "+--------------------+--------------+--------------+-----------+------------+----------------------+"
+	row = "| {:<18} | {:<12} | {:>12} | {:>9} | {:>10} | {:<20} |"
+	print(separator)
+	print(row.format("BoxName", "Platform", "BuildStatus", "NextBuild", "BoxesAhead", "EstimatedAt"))
+	print(separator)
+	for entry in report:
+		if entry.error:
+			print(row.format(entry.boxname, entry.platform or "", "", "", "", entry.error.split(": ", 1)[-1][:20]))
+		elif entry.building:
+			print(row.format(entry.boxname, entry.platform, entry.buildstatus, BS.strf_delta(entry.nextbuild), str(entry.boxesahead), (datetime.now() + entry.nextbuild).strftime("%Y/%m/%d, %H:%M:%S")))
+		else:
+			print(row.format(entry.boxname, entry.platform, entry.buildstatus, "paused", "unclear", "server paused"))
+	print(separator)
+
+
+def printoverview(BS, summaries):  # one row per platform from the cached summaries
+	separator = "+--------------+--------------------+-------+--------+-----------+----------+"
+	row = "| {:<12} | {:<18} | {:>5} | {:>6} | {:>9} | {:>8} |"
+	print(separator)
+	print(row.format("Platform", "BuildBox", "Queue", "Failed", "CycleTime", "Updated"))
+	print(separator)
+	for platform in BS.platlist:
+		summary = summaries.get(platform)
+		if summary:
+			print(row.format(platform, summary.buildbox or "server paused", str(summary.queue), str(summary.failed), BS.strf_delta(timedelta(seconds=summary.cycletime)), datetime.fromtimestamp(summary.timestamp).strftime("%H:%M:%S")))
+		else:
+			print(row.format(platform, "unclear", "", "", "", ""))
+	print(separator)
+
+
 def main(argv):  # shell interface
 	mainfmt = "[__main__]"
-	buildbox, cycle, evaluate, verbose, architecture, supported, usable = False, False, False, False, False, False, False
+	buildbox, cycle, evaluate, verbose, architecture, supported, usable, stats = False, False, False, False, False, False, False, False
 	filename, boxname, cycletime = None, None, None
+	metricsport, textfile, interval, selected = None, None, None, False
+	platformurl, overview = None, False
+	fmt, columns, statusfilter, outfile = None, None, None, None
+	fleet = []  # list of (boxname, architecture or platform) for batch evaluation
 	currarch = "arm_latest"
 	currplat = ""
-	counter, failed = 0, 0
 	helpstring = "Buildstatus v1.3: try 'python Buildstatus.py -h' for more information"
 	BS = Buildstatus()
 	if BS.error:
 		print(f"Error: {BS.error.replace(mainfmt, '').strip()}")
 		exit()
 	try:
-		opts, args = getopt(argv, "a:p:j:e:bcvsuh", ["architecture =", "platform=", "json =", "evaluate =", "buildbox", "cycle", "verbose", "supported", "usable", "help"])
+		opts, args = getopt(argv, "a:p:j:e:bcvsuh", ["architecture =", "platform=", "json =", "evaluate =", "buildbox", "cycle", "verbose", "supported", "usable", "stats", "format=", "columns=", "status=", "output=", "evaluate-file=", "contenturl=", "metrics-port=", "textfile=", "interval=", "platformurl=", "overview", "help"])
 	except GetoptError as error:
 		print(f"Error: {error}\n{helpstring}")
 		exit(2)
@@ -241,6 +1090,7 @@ def main(argv):  # shell interface
 		verbose = True
 	for opt, arg in opts:
 		opt = opt.lower().strip()
+		rawarg = arg.strip()
 		arg = arg.lower().strip()
 		if opt == "-h":
 			print("Usage  : python Buildstatus.py [options...] <data>\n"
@@ -250,15 +1100,29 @@ def main(argv):  # shell interface
 			"-b, --buildbox\t\t\tShow the box for which currently built an image\n"
 			"-c, --cycle\t\t\tShow the estimated duration of a complete build cycle\n"
 			"-v, --verbose\t\t\tPerform with complete image build status overview\n"
-			"-e, --evaluate <boxname>\tEvaluates time until image will be build for desired box\n"
+			"-e, --evaluate <boxname>\tEvaluates time until image will be build for desired box (repeat for many boxes)\n"
+			"    --evaluate-file <filename>\tEvaluates all boxes listed in file (one 'boxname[,architecture]' per line)\n"
 			"-s, --supported\t\t\tShow all currently supported architectures\n"
 			"-u, --usable\t\t\tShow all currently usable platforms\n"
-			"-j, --json <filename>\t\tFile output formatted in JSON")
+			"-j, --json <filename>\t\tFile output formatted in JSON\n"
+			"    --overview\t\t\tShow build box, queue, failed boxes and cycle of all platforms\n"
+			"    --stats\t\t\tShow download and parse statistics\n"
+			"    --format <csv|ndjson|table>\tStream the image build status in the desired format\n"
+			f"    --columns <col,...>\t\tSelect columns: {','.join(COLUMNS)}\n"
+			f"    --status <status,...>\tShow only boxes with build status: {','.join(BUILDSTATES)}\n"
+			"    --output <filename>\t\tStream to file instead of stdout\n"
+			"    --metrics-port <port>\tServe Prometheus metrics on http://<host>:<port>/metrics (long-running)\n"
+			"    --textfile <filename>\tWrite Prometheus metrics for node-exporter's textfile collector\n"
+			f"    --interval <seconds>\tRefresh metrics every <seconds> (default: {CACHETIME}), keeps rewriting the textfile\n"
+			f"    --contenturl <url>\t\tLoad platform data from url instead of '{CONTENTURL}'\n"
+			"    --platformurl <url>\t\tBootstrap from this platform page (default: last known platforms)")
 			exit()
 		if opt in ("-a", "--architecture"):
 			currarch = arg.lower()
+			selected = True
 		elif opt in ("-p", "--platform"):
 			currplat = arg.upper()
+			selected = True
 		elif opt in ("-j", "--json"):
 			filename = arg
 		elif opt in ("-b", "--buildbox"):
@@ -267,6 +1131,14 @@ def main(argv):  # shell interface
 			cycle = True
 		elif opt in ("-e", "--evaluate"):
 			boxname = arg
+			fleet.append((arg, None))
+			evaluate = True
+		elif opt == "--evaluate-file":
+			try:
+				fleet += readfleet(rawarg)
+			except OSError as error:
+				print(f"Error: {error}")
+				exit()
 			evaluate = True
 		elif opt in ("-v", "--verbose"):
 			verbose = True
@@ -274,7 +1146,46 @@ def main(argv):  # shell interface
 			supported = True
 		elif opt in ("-u", "--usable"):
 			usable = True
-	BS.start()  # interactive call without threading
+		elif opt == "--stats":
+			stats = True
+		elif opt == "--format":
+			if arg not in ("csv", "ndjson", "table"):
+				print(f"Unknown format '{arg}'. Supported is: csv, ndjson, table")
+				exit()
+			fmt = arg
+		elif opt == "--columns":
+			colnames = {x.lower(): x for x in COLUMNS}
+			columns = [colnames.get(x.strip()) for x in arg.split(",")]
+			if None in columns:
+				print(f"Unknown column in '{arg}'. Supported is: {', '.join(COLUMNS)}")
+				exit()
+		elif opt == "--status":
+			statenames = {x.lower(): x for x in BUILDSTATES}
+			statusfilter = {statenames.get(x.strip()) for x in arg.split(",")}
+			if None in statusfilter:
+				print(f"Unknown build status in '{arg}'. Supported is: {', '.join(BUILDSTATES)}")
+				exit()
+		elif opt == "--output":
+			outfile = rawarg
+		elif opt == "--contenturl":
+			BS.contenturl = rawarg
+		elif opt == "--platformurl":
+			platformurl = rawarg
+		elif opt == "--overview":
+			overview = True
+		elif opt == "--metrics-port":
+			metricsport = int(arg) if arg.isdigit() else None
+			if metricsport is None:
+				print(f"Invalid port '{arg}'")
+				exit()
+		elif opt == "--textfile":
+			textfile = rawarg
+		elif opt == "--interval":
+			interval = int(arg) if arg.isdigit() and int(arg) else None
+			if interval is None:
+				print(f"Invalid interval '{arg}'")
+				exit()
+	BS.quickstart(currplat.replace("_", " ") if currplat else None, currarch, platformurl)  # first platform page supplies the platform list, if known
 	archlist = BS.archlist
 	platlist = BS.platlist
 	if not currplat:
@@ -290,24 +1201,33 @@ def main(argv):  # shell interface
 	if currplat and currplat not in platlist:
 		print(f"Unknown platform '{currplat.replace(' ', '_').lower()}'. Supported is: {', '.join(x.replace(' ', '_').lower() for x in platlist)}")
 		exit()
+	if overview:  # only platforms whose summary is outdated are fetched
+		printoverview(BS, BS.refreshsummaries())
+		exit()
+	if metricsport is not None or textfile:  # exporter: all platforms, unless one was selected
+		exporter = MetricsExporter(BS, [currplat] if selected else platlist)
+		if metricsport is not None or interval:
+			try:
+				exporter.serve(metricsport, textfile, interval or CACHETIME)
+			except KeyboardInterrupt:
+				pass
+		else:
+			exporter.refresh()
+			if exporter.writeTextfile(textfile):
+				print(f"File '{textfile}' was successfully created.")
+		exit()
 	BS.getbuildinfos(currplat)
 	if BS.error:
 		print(f"Error: {BS.error.replace(mainfmt, '').strip()}")
 		exit()
-	if BS.htmldict and verbose:
-		separator = "+-----+--------------------+--------------------+--------------+----------------------+----------------------+----------------------+-----------+------------+"
-		row = "| {:<3} | {:<18} | {:<18} | {:<12} | {:<20} | {:<20} | {:<20} | {:<9} | {:<10} |"
-		print(f"+{'-' * 156}+")
-		print(f"| {BS.htmldict['title']:<155}|")
-		print(separator)
-		print(row.format(*BS.htmldict["headline"].split(", ")))
-		print(separator)
-		for counter, box in enumerate(BS.htmldict["boxinfo"]):
-			bi = BS.htmldict["boxinfo"][box]
-			print(row.format(bi["No"].rjust(3), box, bi["OemName"], bi["BuildStatus"].rjust(12), bi["StartBuild"], bi["StartFeedSync"], bi["EndBuild"], bi["SyncTime"].rjust(9), bi["BuildTime"].rjust(10)))
-		print(separator)
-		print("| {:<50}{:<48}{:<57}|".format(f"current platform: {currplat.upper()}", f"boxes found: {counter}", f"building errors found: {str(failed).rjust(3)}"))
-		print(f"+{'-' * 156}+")
+	if BS.htmldict and (verbose or fmt):
+		if outfile:
+			with open(outfile, "w", buffering=1 << 16, newline="") as f:
+				rows = export(BS.htmldict, f, fmt or "table", columns, statusfilter, currplat)
+			print(f"File '{outfile}' was successfully created ({rows} rows).")
+		else:
+			export(BS.htmldict, stdout, fmt or "table", columns, statusfilter, currplat)
+			stdout.flush()
 	if BS.htmldict and filename:
 		with open(filename, "w") as f:
 			dump(BS.htmldict, f)
@@ -321,9 +1241,20 @@ def main(argv):  # shell interface
 			print(f"Currently the image is built for: '{buildboxname}'")
 		else:
 			print("At the moment no image is built on the platform!")
-	if evaluate:
+	if evaluate and (len(fleet) > 1 or (fleet and not boxname)):  # batch evaluation
+		boxes = []
+		for fleetbox, token in fleet:
+			if not token:
+				platform = currplat
+			elif token.lower() in archlist:
+				platform = BS.getplatform(token.lower())
+			else:
+				platform = token.replace("_", " ").upper()
+			boxes.append((fleetbox, platform))
+		printfleet(BS, BS.evaluatefleet(boxes))
+	elif evaluate:
 		if boxname:
-			nextbuild, boxesahead, cycletime, counter, failed = BS.evaluate(boxname)
+			nextbuild, boxesahead, cycletime = BS.evaluate(boxname)[:3]
 			if BS.error:
 				print(f"Error: {BS.error.replace(mainfmt, '').strip()}")
 				exit()
@@ -336,7 +1267,7 @@ def main(argv):  # shell interface
 			exit()
 	if cycle:
 		if not cycletime:
-			nextbuild, boxesahead, cycletime, counter, failed = BS.evaluate()
+			cycletime = BS.evaluate()[2]
 			if BS.error:
 				print(f"Error: {BS.error.replace(mainfmt, '').strip()}")
 				exit()
@@ -351,6 +1282,9 @@ def main(argv):  # shell interface
 			print(f"Available architectures: {', '.join(x for x in archlist)}")
 		else:
 			print("No platforms found")
+	if stats:
+		print(f"Statistics: {BS.getstats()}")
+		print(f"Memory: {', '.join(f'{name} {entries} entries {nbytes / 1024:.1f} KiB' for name, (entries, nbytes) in BS.getmemory().items())}")
 
 
 if __name__ == "__main__":
@@ -10,23 +10,23 @@
 #                                                                                                      #
 ########################################################################################################
 
-# PYTHON IMPORTS
+# PYTHON IMPORTS (heavy modules like 'requests', 'zoneinfo', 'xml.etree' and 'shutil' are imported on first use)
 from datetime import datetime, timedelta
-from json import loads
-from os import makedirs
-from os.path import join, exists
+from json import loads, dumps
+from os import environ, makedirs, remove, replace, scandir
+from os.path import join, exists, getmtime, getsize, dirname
 from re import search
-from requests import get, exceptions
-from shutil import rmtree
-from twisted.internet.reactor import callInThread
-from xml.etree.ElementTree import tostring, parse
-from zoneinfo import ZoneInfo
+from threading import Lock, current_thread, main_thread
+from time import time
+from urllib.parse import urlsplit
+from twisted.internet.reactor import callFromThread
 
 # ENIGMA IMPORTS
-from enigma import getDesktop, eTimer, getPeerStreamingBoxes, BT_SCALE, BT_KEEP_ASPECT_RATIO, BT_HALIGN_CENTER, BT_VALIGN_CENTER
-from Components.ActionMap import ActionMap
+from enigma import getDesktop, eTimer, getPeerStreamingBoxes, getPrevAsciiCode, eRCInput, BT_SCALE, BT_KEEP_ASPECT_RATIO, BT_HALIGN_CENTER, BT_VALIGN_CENTER
+from Components.ActionMap import ActionMap, NumberActionMap
 from Components.config import config, ConfigSubsection, ConfigSelection, ConfigText, getConfigListEntry
 from Components.ConfigList import ConfigListScreen
+from Components.Input import Input
 from Components.Label import Label
 from Components.Pixmap import Pixmap
 from Components.Sources.List import List
@@ -39,56 +39,101 @@ from Tools.Directories import resolveFilename, SCOPE_PLUGINS
 
 # PLUGIN IMPORTS
 from . import PLUGINPATH, __version__, _  # for localized messages
-from .Buildstatus import Buildstatus
+from .Buildstatus import Buildstatus, SizedCache, sizeof, CACHETIME
 
 # PLUGIN GLOBALS
-BS = Buildstatus()
-BS.start()
-
-helplist = [x.split(" ")[0] for x in BS.archlist]
-archlist = []
-for arch in helplist:
-	archparts = arch.split("_")
-	version = _("oldest available version") if archparts[1] == "oldest" else _("latest available version")
-	archlist.append((arch, f"{archparts[0].upper()} ({version})"))
-archlist = sorted(list(set(archlist)))
+BS = Buildstatus()  # platform data will be loaded on first use (see 'bootstrap'), so importing the plugin needs no network access
+EX = BS.getexecutor()  # all background work runs here instead of the reactor's thread pool, which is shared with other plugins
+
+
+def getArchChoices():
+	helplist = [x.split(" ")[0] for x in BS.archlist]
+	archlist = []
+	for arch in helplist:
+		archparts = arch.split("_")
+		version = _("oldest available version") if archparts[1] == "oldest" else _("latest available version")
+		archlist.append((arch, f"{archparts[0].upper()} ({version})"))
+	return [("current", _("selected box"))] + sorted(list(set(archlist)))
+
+
+def bootstrap():  # loads platform data from build server (if not done yet) and completes config choices (once)
+	global choicescompleted
+	if not BS.platlist:
+		BS.quickstart(next(iter(FAV.platforms), None))  # the first favorites' platform page supplies the platform list as well
+	if BS.platlist and not choicescompleted:
+		choicescompleted = True
+		favarch = config.plugins.OpenATVstatus.favarch
+		favarch.setChoices(getArchChoices(), default="current")
+		favarch.load()  # restore saved value, which was unknown before the architectures were loaded
+
+
+choicescompleted = False  # architectures choices of 'favarch' have been completed by 'bootstrap'
+
+
 datechoices = [("%d.%m.%Y", "dd.mm.yyyy"), ("%d/%m/%Y", "dd/mm/yyyy"), ("%d-%m-%Y", "dd-mm-yyyy"), ("%Y/%m/%d", "yyyy/mm/dd"),
 				("%Y-%d-%m", "yyyy-mm-dd"), ("%-d.%-m.%Y", "d.m.yyyy"), ("%-m/%-d/%Y", "m/d/yyyy"), ("%Y/%-m/%-d", "yyyy/m/d")]
 config.plugins.OpenATVstatus = ConfigSubsection()
 config.plugins.OpenATVstatus.animate = ConfigSelection(default="50", choices=[("0", _("off")), ("70", _("slower")), ("50", _("normal")), ("30", _("faster"))])
-config.plugins.OpenATVstatus.favarch = ConfigSelection(default="current", choices=[("current", _("selected box"))] + archlist)
+config.plugins.OpenATVstatus.favarch = ConfigSelection(default="current", choices=getArchChoices())
 config.plugins.OpenATVstatus.nextbuild = ConfigSelection(default="relative", choices=[("relative", _("relative time")), ("absolute", _("absolute time"))])
 config.plugins.OpenATVstatus.timezone = ConfigSelection(default="local", choices=[("local", _("local time (this box)")), ("server", _("server time (UTC)"))])
 config.plugins.OpenATVstatus.dateformat = ConfigSelection(default="%d.%m.%Y", choices=datechoices)
 config.plugins.OpenATVstatus.favboxes = ConfigText(default="", fixed_size=False)
+config.plugins.OpenATVstatus.membudget = ConfigSelection(default="0", choices=[("0", _("unlimited")), ("1", "1 MB"), ("2", "2 MB"), ("4", "4 MB"), ("8", "8 MB"), ("16", "16 MB")])
 
 
 class ATVglobs:
 	VERSION = f"v{__version__}"
 	MODULE_NAME = __name__.split(".")[-2]
-	FAVLIST = [tuple(x.strip() for x in item.replace("(", "").replace(")", "").split(",")) for item in config.plugins.OpenATVstatus.favboxes.value.split(";")] if config.plugins.OpenATVstatus.favboxes.value else []
-	PICURL = "https://raw.githubusercontent.com/oe-alliance/remotes/master/boxes/"
+	PICURL = environ.get("OPENATVSTATUS_PICURL", "https://raw.githubusercontent.com/oe-alliance/remotes/master/boxes/")  # endpoints may point to a local stand-in server
+	STATUSURL = environ.get("OPENATVSTATUS_STATUSURL", "https://ampel.mynonpublic.com/status/index.php?boxname=")
 	TEMPPATH = "/tmp/OpenATVstatus/"
+	PREFETCHDELAY = 1500  # rate limit for speculative prefetching of platforms in msec
+	PREFETCHBOXES = 8  # box pictures prefetched on each side of the selected box in the images list (besides the platform's favorites), none in low-memory mode
+	DEBOUNCEDELAY = 300  # delay in msec before a platform will be fetched while scrolling fast through platforms
+	FRAMEDELAY = 250  # minimum interval in msec between two redraws caused by worker threads, updates arriving meanwhile are merged
+	COUNTDOWNDELAY = 60000  # interval in msec the shown ETAs are counted down locally
+	REFRESHAGE = 600  # seconds after which shown platform data will be refetched, even if no build should have ended yet
 	ICONPATH = resolveFilename(SCOPE_PLUGINS, "Extensions/OpenATVstatus/icons/")
+	SKINFILE = None  # resolved once on first use, the desktop resolution does not change at runtime
+	SKINCACHE = {}  # {skinfile: (mtime, {screenname: skintext})}
+	STATUSCACHE = SizedCache()  # server status icon of each box: {boxname: (timestamp, iconname)}
+	CACHELOCK = Lock()  # guards 'STATUSCACHE'
+	MEMBUDGET = 0  # bytes all caches may use together, 0 = unlimited (see 'applyBudget')
+	BUDGETSHARES = {"platforms": 0.5, "pictures": 0.25, "files": 0.15, "status": 0.05, "peers": 0.05}  # split of the memory budget among the caches and the picture files in TEMPPATH (tmpfs)
 
 	def readSkin(self, skin):
-		skintext = ""
-		skinfile = join(PLUGINPATH, f"skin_{'fHD' if getDesktop(0).size().width() > 1300 else 'HD'}.xml")
+		if ATVglobs.SKINFILE is None:
+			ATVglobs.SKINFILE = join(PLUGINPATH, f"skin_{'fHD' if getDesktop(0).size().width() > 1300 else 'HD'}.xml")
+		skinfile = ATVglobs.SKINFILE
+		try:
+			mtime = getmtime(skinfile)
+		except OSError as error:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'readSkin': Unexpected error opening skin file '{skinfile}'! '{error}'!")
+			return ""
+		cached = self.SKINCACHE.get(skinfile)
+		if cached is None or cached[0] != mtime:  # parse skin file once and again only if it has changed
+			self.SKINCACHE[skinfile] = cached = (mtime, self.parseSkin(skinfile))
+		return cached[1].get(skin, "")
+
+	def parseSkin(self, skinfile):  # creates a table of all screens: {screenname: skintext}
+		from xml.etree.ElementTree import tostring, parse
+		skins = {}
 		try:
 			with open(skinfile) as file:
 				try:
 					domskin = parse(file).getroot()
 					for element in domskin:
-						if element.tag == "screen" and element.attrib["name"] == skin:
-							skintext = tostring(element).decode()
-							break
+						if element.tag == "screen":
+							skins[element.attrib["name"]] = tostring(element).decode()
 				except Exception as error:
 					print(f"[{self.MODULE_NAME}] ERROR in module 'readSkin': Unable to parse skin data in '{skinfile}' - '{error}'!")
 		except OSError as error:
 			print(f"[{self.MODULE_NAME}] ERROR in module 'readSkin': Unexpected error opening skin file '{skinfile}'! '{error}'!")
-		return skintext
+		return skins
 
 	def fmtDateTime(self, datetimestr):
+		from zoneinfo import ZoneInfo
 		if datetimestr:
 			if datetimestr != "00:00:00":
 				berlin = datetime.strptime(datetimestr, "%Y/%m/%d, %H:%M:%S").replace(tzinfo=ZoneInfo("Europe/Berlin"))  # server time
@@ -100,6 +145,66 @@ class ATVglobs:
 				datetimestr = ""
 		return datetimestr
 
+	def serverNow(self):
+		from zoneinfo import ZoneInfo
+		return datetime.now(tz=ZoneInfo("Europe/Berlin"))
+
+	def fmtRemaining(self, deadline):  # time left until deadline (timestamp) as 'hh:mm h', never negative
+		return f"{BS.strf_delta(timedelta(seconds=max(0, deadline - time())))[:5]} h"
+
+	def resolvePlatform(self, currarch):  # for compatibility reasons: use oldest available platform if architecture version-no. is missing (older plugin releases)
+		return next((plat for plat in BS.platlist if currarch.split(" ")[0].upper() in plat), currarch) if len(currarch.split(" ")) == 1 else currarch
+
+	def getCachedStatus(self, boxname):  # server status icon from memory if still fresh
+		with self.CACHELOCK:
+			entry = self.STATUSCACHE.get(boxname)
+		return entry[1] if entry and time() - entry[0] < self.REFRESHAGE else None
+
+	def loadServerStatus(self, boxname):  # downloads the server status of box, returns the icon's name (decoded once) or None
+		from requests import get, exceptions
+		if not boxname:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'getstatus': missing boxname")
+			return None
+		EX.acquire()
+		try:
+			response = get(f"{self.STATUSURL}{boxname}".encode(), timeout=(3.05, 6))
+			response.raise_for_status()
+		except exceptions.RequestException as error:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'getServerStatus': {str(error)}")
+			return None
+		try:
+			server = search(r"src='(.*?)'/></center>", response.content.decode())
+		except Exception as err:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'getstatus': invalid data from server {str(err)}")
+			return None
+		if not server:
+			return None
+		PC.decode(join(self.ICONPATH, server.group(1)))  # decoded only once
+		entry = (time(), server.group(1))
+		with self.CACHELOCK:
+			self.STATUSCACHE.put(boxname, entry, sizeof(entry) + sizeof(boxname))
+		return server.group(1)
+
+	def getMemoryUse(self):  # memory use of every cache: {name: (number of entries, bytes)}
+		memory = BS.getmemory()
+		with PC.lock:
+			memory["pictures"] = PC.pixmaps.usage()
+			memory["manifest"] = (len(PC.manifest or {}), sizeof(PC.manifest) if PC.manifest else 0)
+		memory["picture files"] = PC.diskUsage()  # TEMPPATH is in tmpfs: the files use memory as well
+		with self.CACHELOCK:
+			memory["status"] = self.STATUSCACHE.usage()
+		with PP.lock:
+			memory["peers"] = PP.peers.usage()
+		memory["skins"] = (sum(len(entry[1]) for entry in self.SKINCACHE.values()), sizeof(self.SKINCACHE))
+		return memory
+
+	def fmtMemoryUse(self):  # e.g. 'platforms: 5 / 412 KiB, pictures: 18 / 1150 KiB, ...'
+		return ", ".join(f"{name}: {entries} / {round(nbytes / 1024)} KiB" for name, (entries, nbytes) in self.getMemoryUse().items())
+
+	def isOutdated(self, timestamp, expires):  # data is refetched only if a build should have ended meanwhile or if it is too old
+		age = time() - timestamp
+		return age > CACHETIME and (age > self.REFRESHAGE or (expires is not None and time() >= expires))
+
 	def roundMinutes(self, timestr):
 		if timestr:
 			timestr = timestr.split(",")  # handle those exceptions: e.g. '-1 day, 23:59:24'
@@ -201,6 +306,457 @@ class Carousel(ATVglobs):
 			self.callback((self.prevstr, self.currstr, self.nextstr))
 
 
+class ImagesListModel(ATVglobs):  # cached and indexed view model of a platform snapshot for 'ATVimageslist'
+	PALETTE = {"Building": 0x00B028, "Failed": 0xFF0400, "Complete": 0xB0B0B0, "Waiting": 0xFFAE00}
+	FAVCOLOR = 0xFDFF00
+
+	def __init__(self):
+		self.result = None  # platform snapshot the model was built for
+		self.boxlist = []  # list of all rows: [(boxname, platform), ...]
+		self.boxindex = {}  # row index of each box: {(boxname, platform): index}
+		self.basecells = []  # snapshot depending cells of each row: (No, BoxName, BuildStatus, SyncTime, BuildTime, statuscolor)
+		self.datecells = []  # config depending cells of each row: (StartBuild, StartFeedSync, EndBuild)
+		self.datekey = None  # (snapshot, date format, timezone) the date cells were formatted for
+		self.colors = []
+		self.colorkey = None  # favorites of this platform the colors were set for
+		self.menulist = []
+
+	def update(self, result, favorites):  # rebuilds only those columns whose inputs have changed and returns the menulist
+		changed = False
+		if self.result is None or result.htmldict is not self.result.htmldict:  # unchanged snapshots (e.g. 'not modified') are reused
+			self.result = result
+			self.boxlist, self.basecells = [], []
+			boxinfo = result.htmldict["boxinfo"] if result and result.htmldict else {}
+			for boxname, bd in boxinfo.items():
+				self.boxlist.append((boxname, result.platform))
+				self.basecells.append((bd["No"], boxname, bd["BuildStatus"], self.roundMinutes(bd["SyncTime"].strip()), self.roundMinutes(bd["BuildTime"].strip()), self.PALETTE.get(bd["BuildStatus"], 0xB0B0B0)))
+			self.boxindex = {box: index for index, box in enumerate(self.boxlist)}
+			self.datekey, self.colorkey = None, None
+			changed = True
+		datekey = (id(result.htmldict), config.plugins.OpenATVstatus.dateformat.value, config.plugins.OpenATVstatus.timezone.value)
+		if datekey != self.datekey:
+			self.datekey = datekey
+			boxinfo = result.htmldict["boxinfo"] if result and result.htmldict else {}
+			self.datecells = [(self.fmtDateTime(bd["StartBuild"]), self.fmtDateTime(bd["StartFeedSync"]), self.fmtDateTime(bd["EndBuild"])) for bd in boxinfo.values()]
+			changed = True
+		colorkey = frozenset((boxname, result.platform) for boxname in favorites.boxnames(result.platform) if (boxname, result.platform) in self.boxindex)
+		if colorkey != self.colorkey:
+			self.colorkey = colorkey
+			self.colors = [self.FAVCOLOR if box in colorkey else cells[5] for box, cells in zip(self.boxlist, self.basecells)]
+			changed = True
+		if changed:
+			self.menulist = [(cells[0], cells[1], cells[2], *dates, cells[3], cells[4], color) for cells, dates, color in zip(self.basecells, self.datecells, self.colors)]
+		return self.menulist
+
+
+class PeerProbe(ATVglobs):  # asynchronous discovery and parallel probing of peer boxes in the local network
+	PEERTTL = 180  # seconds the online/offline state of peers is considered as valid
+
+	def __init__(self):
+		self.peers = SizedCache()  # {streamurl: (timestamp, info or None)}
+		self.discovered = 0  # timestamp of last peer discovery
+		self.pending = 0  # number of running peer probes
+		self.probing = False
+		self.callbacks = []
+		self.lock = Lock()
+
+	def lookup(self, boxname):  # returns (status, info) from cache or None if unknown, outdated or still being probed
+		now = time()
+		with self.lock:
+			for streamurl, (timestamp, info) in self.peers.items():
+				if (urlsplit(streamurl).hostname or "").split(".")[0] == boxname and now - timestamp < self.PEERTTL:  # example streamurls: ['http://gbue4k.local:8001', 'http://sf8008.local:8001']
+					return ("online" if info else "offline"), info
+			if not self.probing and now - self.discovered < self.PEERTTL:
+				return "offline", None  # box was not discovered as peer
+
+	def probe(self, callback=None):  # must be called on the reactor thread (it maintains the peer list): probes all peers in background, 'callback(streamurl, info)' runs on the reactor thread
+		with self.lock:
+			if callback:
+				self.callbacks.append(callback)
+			if self.probing:
+				return
+			self.probing = True
+		streamurls = getPeerStreamingBoxes() or []
+		with self.lock:
+			self.discovered = time()
+			self.pending = len(streamurls)
+			if not streamurls:
+				self.probing = False
+		for streamurl in streamurls:  # all peers will be probed in parallel
+			EX.submit("status", self.probePeer, streamurl)
+		if not streamurls:
+			self.notify(None, None)
+
+	def probePeer(self, streamurl):
+		from requests import get, exceptions
+		apiurl = f"{streamurl[:streamurl.rfind(':')]}:80/api/about"
+		info = None
+		try:
+			response = get(apiurl, timeout=(1.5, 3))
+			response.raise_for_status()
+			info = loads(response.content).get("info")
+		except (exceptions.RequestException, ValueError, AttributeError) as error:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'probePeer': {str(error)}")
+		with self.lock:
+			self.peers.put(streamurl, (time(), info or None), sizeof(streamurl) + sizeof(info))
+			self.pending -= 1
+			if not self.pending:
+				self.probing = False
+		self.notify(streamurl, info)
+
+	def notify(self, streamurl, info):
+		with self.lock:
+			callbacks = self.callbacks[:]
+			if not self.probing:
+				self.callbacks = []
+		for callback in callbacks:
+			callFromThread(callback, streamurl, info)
+
+
+PP = PeerProbe()
+
+
+class PixmapCache(ATVglobs):  # decoded pixmaps keyed by path and mtime, box pictures are kept as thumbnails pre-scaled to the skin's row size
+	PICTUREAGE = 86400  # seconds a downloaded box picture is used without asking the server whether it has changed
+
+	def __init__(self):
+		self.pixmaps = SizedCache()  # {path: (mtime, pixmap)}, bytes of the decoded pixmap
+		self.thumbsize = None  # (width, height) of the box picture in the favorites' list (depends on HD/fHD skin)
+		self.manifest = None  # validators of all downloaded box pictures: {boxname: [etag, lastmodified, checked]}
+		self.session = None  # pooled keep-alive connections to the picture server
+		self.filebudget = 0  # bytes the picture files in TEMPPATH may use, 0 = unlimited
+		self.lock = Lock()
+
+	def get(self, path):  # decoded pixmap from memory only, without any file system access
+		with self.lock:
+			entry = self.pixmaps.get(path)
+		return entry[1] if entry else None
+
+	def lookup(self, path):  # like 'get', but in low-memory mode evicted pixmaps are decoded again from their file
+		return self.get(path) or (self.load(path) if self.pixmaps.maxbytes else None)
+
+	def load(self, path):  # decodes the file only if it is new or has changed, returns None if file is missing
+		try:
+			mtime = getmtime(path)
+		except OSError:
+			return None
+		with self.lock:
+			entry = self.pixmaps.get(path)
+		if entry and entry[0] == mtime:
+			return entry[1]
+		pixmap = LoadPixmap(cached=False, path=path)  # enigma's own cache would ignore a changed file
+		with self.lock:
+			self.pixmaps.put(path, (mtime, pixmap), self.pixmapBytes(pixmap))
+		return pixmap
+
+	def decode(self, path):  # 'load' for worker threads: LoadPixmap runs on the reactor thread, before any redraw posted afterwards
+		if exists(path):
+			callFromThread(self.load, path)
+
+	def pixmapBytes(self, pixmap):  # decoded pixmaps are kept as 32-bit surfaces
+		size = pixmap.size() if hasattr(pixmap, "size") else None
+		return size.width() * size.height() * 4 if size else 0
+
+	def clear(self, folder=None):  # forgets all pixmaps (of folder only)
+		with self.lock:
+			for path in [path for path in self.pixmaps if folder is None or path.startswith(folder)]:
+				self.pixmaps.pop(path)
+
+	def release(self):  # forgets all pixmaps, the manifest and the connections (e.g. in standby), the pictures on disk are kept
+		with self.lock:
+			self.pixmaps.clear()
+			self.manifest = None  # reloaded from file on demand
+			session, self.session = self.session, None
+		if session:
+			session.close()
+
+	def getThumbSize(self):
+		if self.thumbsize is None:
+			size = search(r"size=\((\d+),\s*(\d+)\),\s*png=9", self.readSkin("ATVfavorites"))  # cell of the box picture
+			self.thumbsize = (int(size.group(1)), int(size.group(2))) if size else (250, 64)
+		return self.thumbsize
+
+	def diskUsage(self):  # (number of files, bytes) of the downloaded pictures, thumbnails and manifest in TEMPPATH
+		count = nbytes = 0
+		for folder in (self.TEMPPATH, join(self.TEMPPATH, "thumbs")):
+			try:
+				with scandir(folder) as entries:
+					for entry in entries:
+						if entry.is_file():
+							count += 1
+							nbytes += entry.stat().st_size
+			except OSError:
+				pass
+		return count, nbytes
+
+	def thumbPath(self, boxname):
+		return join(self.TEMPPATH, "thumbs", f"{boxname}.png")
+
+	def getSession(self):  # all pictures share one connection per worker instead of a new connection per picture
+		with self.lock:
+			if self.session is None:
+				from requests import Session
+				from requests.adapters import HTTPAdapter
+				self.session = Session()
+				for prefix in ("http://", "https://"):
+					self.session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=EX.maxworkers))
+			return self.session
+
+	def getManifest(self):  # must be called with lock held
+		if self.manifest is None:
+			try:
+				with open(join(self.TEMPPATH, "manifest.json")) as file:
+					self.manifest = loads(file.read())
+			except (OSError, ValueError):
+				self.manifest = {}
+		return self.manifest
+
+	def saveManifest(self):
+		manifestfile = join(self.TEMPPATH, "manifest.json")
+		with self.lock:
+			content = dumps(self.getManifest())
+		try:
+			makedirs(self.TEMPPATH, exist_ok=True)
+			with open(f"{manifestfile}.tmp", "w") as file:
+				file.write(content)
+			replace(f"{manifestfile}.tmp", manifestfile)  # atomic: a concurrent reader never sees a partial manifest
+		except OSError as error:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'saveManifest': {str(error)}")
+
+	def outdated(self, boxnames):  # boxnames whose picture is missing or has not been revalidated for PICTUREAGE seconds
+		with self.lock:
+			manifest = self.getManifest()
+			checked = {boxname: manifest[boxname][2] for boxname in boxnames if boxname in manifest}
+		now = time()
+		return [boxname for boxname in boxnames if now - checked.get(boxname, 0) >= self.PICTUREAGE or not exists(self.thumbPath(boxname))]
+
+	def download(self, boxname, save=True, original=True):  # downloads the box picture if new or changed, returns True if the picture is available
+		from requests import exceptions
+		thumbfile = self.thumbPath(boxname)
+		with self.lock:
+			entry = self.getManifest().get(boxname)
+		headers = {}
+		if entry and exists(thumbfile) and (not original or exists(join(self.TEMPPATH, f"{boxname}.png"))):  # conditional request
+			if entry[0]:
+				headers["If-None-Match"] = entry[0]
+			if entry[1]:
+				headers["If-Modified-Since"] = entry[1]
+		EX.acquire()
+		try:
+			response = self.getSession().get(f"{self.PICURL}{boxname}.png".encode(), headers=headers, timeout=(3.05, 6))
+			response.raise_for_status()
+		except exceptions.RequestException as error:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'imageDownload': {str(error)}")
+			return False
+		if response.status_code == 304:  # unchanged
+			self.decode(thumbfile)
+		else:
+			makedirs(self.TEMPPATH, exist_ok=True)
+			self.savePicture(boxname, response.content, original)
+		with self.lock:
+			self.getManifest()[boxname] = [response.headers.get("ETag"), response.headers.get("Last-Modified"), time()]
+		if save:
+			self.evictFiles(save=False)
+			self.saveManifest()
+		return True
+
+	def downloadAll(self, boxnames, callback=None):  # bulk mode for the boxes of a platform: only new or outdated pictures, the manifest is saved once
+		for boxname in self.outdated(boxnames):
+			if self.download(boxname, save=False, original=not self.MEMBUDGET) and callback:  # low-memory mode: thumbnails only, box details load their full-size picture
+				callback(boxname)
+		self.evictFiles(save=False)
+		self.saveManifest()
+
+	def evictFiles(self, save=True):  # deletes the pictures checked longest ago until the files fit into 'filebudget', the newest picture is always kept
+		if not self.filebudget:
+			return
+		with self.lock:
+			manifest = self.getManifest()
+			boxnames = sorted(manifest, key=lambda boxname: manifest[boxname][2])
+		nbytes = self.diskUsage()[1]
+		evicted = []
+		for boxname in boxnames[:-1]:
+			if nbytes <= self.filebudget:
+				break
+			for path in (join(self.TEMPPATH, f"{boxname}.png"), self.thumbPath(boxname)):
+				try:
+					nbytes -= getsize(path)
+					remove(path)
+				except OSError:
+					pass
+			evicted.append(boxname)
+		if evicted:
+			with self.lock:
+				for boxname in evicted:
+					self.getManifest().pop(boxname, None)
+					self.pixmaps.pop(self.thumbPath(boxname))
+			if save:
+				self.saveManifest()
+
+	def savePicture(self, boxname, content, original=True):  # stores the thumbnail (favorites) and the full-size picture (box details) if wanted, the thumbnail will be decoded
+		picfile = join(self.TEMPPATH, f"{boxname}.png")
+		if original:
+			with open(picfile, "wb") as f:
+				f.write(content)
+		elif exists(picfile):  # outdated by the new picture
+			remove(picfile)
+		thumbfile = self.thumbPath(boxname)
+		makedirs(dirname(thumbfile), exist_ok=True)
+		try:
+			from io import BytesIO
+			from PIL import Image  # optional: without Pillow the full-size picture will be scaled at render time
+			with Image.open(BytesIO(content)) as image:
+				image.thumbnail(self.getThumbSize(), Image.LANCZOS)
+				image.save(thumbfile, "PNG")
+		except Exception as error:
+			if not isinstance(error, ImportError):
+				print(f"[{self.MODULE_NAME}] ERROR in module 'savePicture': {str(error)}")
+			with open(thumbfile, "wb") as f:
+				f.write(content)
+		self.decode(thumbfile)
+
+
+PC = PixmapCache()
+
+
+class Dispatcher(ATVglobs):  # marshals results of worker threads to the reactor thread and merges the updates of one frame
+	def __init__(self):
+		self.pending = {}  # updates of the current frame in order of posting: {(screen id, key): (func, args)}
+		self.screens = set()  # ids of attached screens which have not been closed yet
+		self.flushed = {}  # time of the last redraw of each screen: {screen id: timestamp}
+		self.due = None  # time the pending updates will be applied
+		self.timer = None
+		self.lock = Lock()
+
+	def attach(self, screen):  # updates of screen will be applied until it is closed
+		with self.lock:
+			self.screens.add(id(screen))
+		screen.onClose.append(lambda: self.detach(screen))
+
+	def detach(self, screen):  # drops pending updates of a closed screen
+		with self.lock:
+			self.screens.discard(id(screen))
+			self.flushed.pop(id(screen), None)
+			for key in [key for key in self.pending if key[0] == id(screen)]:
+				del self.pending[key]
+
+	def post(self, screen, key, func, *args):  # 'func(*args)' will run on the reactor thread, a later update of the same key replaces the former one
+		with self.lock:
+			if id(screen) not in self.screens:
+				return
+			self.pending.pop((id(screen), key), None)  # the replacing update moves to the end, e.g. a redraw after all cell updates
+			if current_thread() is main_thread():  # posted from the reactor thread (e.g. cached data): no need to wait
+				immediate = True
+			else:
+				immediate = False
+				self.pending[(id(screen), key)] = (func, args)
+				due = max(time(), self.flushed.get(id(screen), 0) + self.FRAMEDELAY / 1000)  # first update after a quiet frame is shown at once
+				schedule = self.due is None or due < self.due
+				if schedule:
+					self.due = due
+		if immediate:
+			func(*args)
+		elif schedule:
+			callFromThread(self.schedule)
+
+	def schedule(self):
+		if self.timer is None:
+			self.timer = eTimer()
+			self.timer.callback.append(self.flush)
+		with self.lock:
+			due = self.due
+		if due is not None:
+			self.timer.start(max(0, int((due - time()) * 1000)), True)
+
+	def flush(self):
+		with self.lock:
+			pending, self.pending = self.pending, {}
+			self.due = None
+			now = time()
+			for screenid, key in pending:
+				self.flushed[screenid] = now
+		for (screenid, key), (func, args) in pending.items():
+			if screenid in self.screens:  # screen may have been closed by a former update
+				func(*args)
+
+
+DP = Dispatcher()
+
+
+class Favorites(ATVglobs):  # favorites (boxname, platform) indexed and grouped by platform, kept in sync with 'favboxes' without re-parsing it
+	def __init__(self, configelement):
+		self.configelement = configelement  # stored as '(boxname,platform);(boxname,platform);...'
+		self.entries = {}  # serialized entry of each favorite in order of addition: {(boxname, platform): '(boxname,platform)'}
+		self.platforms = {}  # favorites grouped by platform in order of addition: {platform: {boxname: None}}
+		self.version = 0  # counts changes, so screens can tell whether the favorites have changed meanwhile
+		self.favlist = None  # cached ordered list of all favorites
+		self.parse(configelement.value)
+
+	def __contains__(self, box):
+		return box in self.entries
+
+	def __len__(self):
+		return len(self.entries)
+
+	def parse(self, value):  # only needed once on startup (or if the favorites were replaced completely)
+		self.entries.clear()
+		self.platforms.clear()
+		for item in value.split(";") if value else []:
+			box = tuple(x.strip() for x in item.replace("(", "").replace(")", "").split(","))
+			if len(box) == 2 and box not in self.entries:
+				self.insert(box)
+		self.changed()
+
+	def insert(self, box):
+		self.entries[box] = f"({box[0]},{box[1]})"
+		self.platforms.setdefault(box[1], {})[box[0]] = None
+
+	def changed(self):
+		self.version += 1
+		self.favlist = None
+
+	def add(self, box):  # appends the new entry to the stored string, returns False if box is already a favorite
+		if box in self.entries:
+			return False
+		self.insert(box)
+		value = self.configelement.value
+		self.configelement.value = f"{value};{self.entries[box]}" if value else self.entries[box]
+		self.configelement.save()
+		self.changed()
+		return True
+
+	def remove(self, box):  # joins the already serialized entries of the remaining favorites, returns False if box is no favorite
+		if self.entries.pop(box, None) is None:
+			return False
+		boxnames = self.platforms[box[1]]
+		del boxnames[box[0]]
+		if not boxnames:
+			del self.platforms[box[1]]
+		self.configelement.value = ";".join(self.entries.values())
+		self.configelement.save()
+		self.changed()
+		return True
+
+	def replace(self, boxes):  # replaces all favorites at once
+		self.configelement.value = ";".join(f"({boxname},{platform})" for boxname, platform in boxes)
+		self.configelement.save()
+		self.parse(self.configelement.value)
+
+	def list(self):  # ordered list of all favorites, rebuilt only after changes
+		if self.favlist is None:
+			self.favlist = list(self.entries)
+		return self.favlist
+
+	def boxnames(self, platform):  # favorites' boxnames of this platform (in order of addition)
+		return self.platforms.get(platform, {})
+
+	def snapshot(self):  # copy of 'platforms' for worker threads, taken on the reactor thread (the favorites may change meanwhile): [(platform, [boxname, ...]), ...]
+		return [(platform, list(boxnames)) for platform, boxnames in self.platforms.items()]
+
+
+FAV = Favorites(config.plugins.OpenATVstatus.favboxes)
+
+
 class ATVfavorites(Screen, ATVglobs):
 	def __init__(self, session):
 		self.session = session
@@ -208,8 +764,12 @@ class ATVfavorites(Screen, ATVglobs):
 		Screen.__init__(self, session, self.skin)
 		self.setTitle(_("Favorites"))
 		self.boxlist = []
-		self.foundFavs = []
+		self.baselist = []
+		self.rowindex = {}  # row index of each favorite: {(boxname, platform): index}
+		self.deadlines = {}  # estimated end of next build of each favorite: {(boxname, platform): timestamp}
+		self.platexpiry = {}  # fetch time and estimated end of current build of each platform: {platform: (timestamp, expires)}
 		self.platdict = {}
+		self.favversion = FAV.version
 		self.currindex = 0
 		self["version"] = Label(self.VERSION)
 		self["platinfo"] = Label()
@@ -236,7 +796,10 @@ class ATVfavorites(Screen, ATVglobs):
 													"info": self.keyInfo,
 													"menu": self.openConfig
 													}, -1)
+		self.countdownTimer = eTimer()
+		self.countdownTimer.callback.append(self.countdown)
 		self.onLayoutFinish.append(self.onLayoutFinished)
+		DP.attach(self)
 		try:
 			if not exists(self.TEMPPATH):
 				makedirs(self.TEMPPATH, exist_ok=True)
@@ -244,133 +807,123 @@ class ATVfavorites(Screen, ATVglobs):
 			self.session.open(MessageBox, f"Dateipfad für Boxbilder konnte nicht neu angelegt werden:\n'{error}'", type=MessageBox.TYPE_INFO, timeout=2, close_on_any_key=True)
 
 	def onLayoutFinished(self):
-		callInThread(self.createMenulist)
+		PP.probe(self.probeCB)  # peers' online/offline state for the list and box details
+		EX.submit("list", self.createMenulist, FAV.snapshot(), self.REFRESHAGE)  # data of the session-start warmup counts down locally
+		self.countdownTimer.start(self.COUNTDOWNDELAY, False)
 
-	def createMenulist(self):
+	def createMenulist(self, favorites, maxage=CACHETIME):  # runs on a worker thread: fetches and evaluates, 'showMenulist' shows the result on the reactor thread
 		boxlist = []
 		baselist = []
-		boxpiclist = []
 		statuslist = []
-		self.currindex = 0
-		self["menu"].setList([])
-		if self.FAVLIST and BS.platlist:
+		deadlines = {}
+		platexpiry = {}
+		platdict = {}
+		if favorites and BS.platlist:
+			palette = {"Building": 0x00B028, "Failed": 0xFF0400, "Complete": 0xFFFFFF, "Waiting": 0xFFAE00}
+			absolute = config.plugins.OpenATVstatus.nextbuild.value == "absolute"
+			for currarch, boxnames in favorites:  # one pass per platform
+				currplat = self.resolvePlatform(currarch)
+				result = BS.fetch(currplat, maxage)
+				boxinfo = result.htmldict["boxinfo"] if result.htmldict else {}
+				platexpiry[currarch] = (result.timestamp, result.expires())
+				if boxinfo:  # favorites' platform found
+					etas, cycletime, counter, failed = result.evaluateall()
+					buildbox = result.findbuildbox()
+					platdict[currarch] = {"cycletime": f"{BS.strf_delta(cycletime)[:5]} h", "boxcounter": f"{counter}", "boxfailed": f"{failed}"}
+				for boxname in boxnames:
+					box = (boxname, currarch)
+					bd = boxinfo.get(boxname)
+					if bd:
+						nextbuild, boxesahead = etas[boxname]
+						if buildbox:  # ETA counts from fetch time (the data may have been cached for a while)
+							deadlines[box] = deadline = result.timestamp + nextbuild.total_seconds()
+							nextbuild = self.fmtDateTime((self.serverNow() + timedelta(seconds=max(0, deadline - time()))).strftime("%Y/%m/%d, %H:%M:%S")) if absolute and nextbuild else self.fmtRemaining(deadline)
+						else:
+							nextbuild, boxesahead = "server paused", "unclear"
+						serverstatus = self.getCachedStatus(boxname)
+						if not serverstatus:
+							statuslist.append(box)  # collect all missing server status (avoids flickering in menu)
+						textlist = [boxname, currarch, bd["BuildStatus"], self.roundMinutes(bd["BuildTime"].strip()), f"{boxesahead}", self.fmtDateTime(bd["StartBuild"]), self.fmtDateTime(bd["EndBuild"]), nextbuild, palette.get(bd["BuildStatus"], 0xB0B0B0), serverstatus]
+					else:  # favorites' platform (or box on this platform) not found
+						textlist = [boxname, currarch, "unclear", "no server", "no server", "no server found", "no server found", "no server found", 0xFF0400, None]
+					boxlist.append(box)
+					baselist.append(textlist)
+					thumbfile = PC.thumbPath(boxname)
+					PC.get(thumbfile) or PC.decode(thumbfile)  # pictures already on disk are decoded before the list is shown
+		DP.post(self, "menulist", self.showMenulist, baselist, boxlist, deadlines, platexpiry, platdict)
+		for box in statuslist:  # download missing server status
+			EX.submit("status", self.getServerStatus, box)
+		requested = set()  # boxes of the same name share their picture
+		for currarch, boxnames in favorites:  # download new or outdated box pictures in bulk per platform
+			boxnames = [boxname for boxname in boxnames if boxname not in requested]
+			requested.update(boxnames)
+			if boxnames:
+				EX.submit("picture", PC.downloadAll, boxnames, self.imageDownloadCB)
+
+	def showMenulist(self, baselist, boxlist, deadlines, platexpiry, platdict):
+		selected = self.boxlist[self.currindex] if self.boxlist and self.currindex is not None and self.currindex < len(self.boxlist) else None
+		self.baselist = baselist
+		self.boxlist = boxlist
+		self.rowindex = {box: index for index, box in enumerate(boxlist)}
+		self.deadlines = deadlines
+		self.platexpiry = platexpiry
+		self.platdict.update(platdict)
+		self.currindex = self.rowindex.get(selected, 0)  # a refresh keeps the selected favorite
+		if boxlist:
 			self["menu"].style = "default"
-			usedarchs = []
-			for favorite in self.FAVLIST:
-				currfav = favorite[1]
-				if currfav not in usedarchs:
-					usedarchs.append(currfav)
-			menulist = []
-			for currarch in usedarchs:
-				# for compatibility reasons: use oldest available platform if architecture version-no. is missing (older plugin releases)
-				currplat = [plat for plat in BS.platlist if currarch.split(" ")[0].upper() in plat][0] if len(currarch.split(" ")) == 1 else currarch
-				htmldict = BS.getbuildinfos(currplat)
-				boxpix = None
-				textlist = ["no box", "no platform", "unclear", "no server", "no server", "no server found", "no server found", "no server found", 0xFF0400, None]
-				if htmldict:  # favorites' platform found
-					for box in [item for item in self.FAVLIST if item[1] in set([item[1]])]:
-						if box[1] in currarch and box[0] in htmldict["boxinfo"]:
-							boxlist.append((box[0], currarch))
-							bd = htmldict["boxinfo"][box[0]]
-							palette = {"Building": 0x00B028, "Failed": 0xFF0400, "Complete": 0xFFFFFF, "Waiting": 0xFFAE00}
-							color = palette.get(bd["BuildStatus"], 0xB0B0B0)
-							nextbuild, boxesahead, cycletime, counter, failed = BS.evaluate(box[0])
-							if box[1] not in self.platdict:
-								self.platdict[currplat] = {}
-								self.platdict[currplat]["cycletime"] = f"{BS.strf_delta(cycletime)[:5]} h"
-								self.platdict[currplat]["boxcounter"] = f"{counter}"
-								self.platdict[currplat]["boxfailed"] = f"{failed}"
-							if BS.findbuildbox():
-								nextbuild = self.fmtDateTime((datetime.now(tz=ZoneInfo("Europe/Berlin")) + nextbuild).strftime("%Y/%m/%d, %H:%M:%S")) if config.plugins.OpenATVstatus.nextbuild.value == "absolute" and nextbuild else f"{BS.strf_delta(nextbuild)[:5]} h"
-							else:
-								nextbuild, boxesahead = "server paused", "unclear"
-							buildtime = self.roundMinutes(bd["BuildTime"].strip())
-							statuslist.append(box)  # collect all server status (avoids flickering in menu)
-							textlist = [box[0], box[1], bd["BuildStatus"], buildtime, f"{boxesahead}", self.fmtDateTime(bd["StartBuild"]), self.fmtDateTime(bd["EndBuild"]), nextbuild, color, None]
-							baselist.append(textlist)
-							boxpix = self.imageDisplay(box)
-							if not boxpix:
-								boxpiclist.append(box[0])  # collect missing box pictures (avoids flickering in menu)
-				else:  # favorites' platform not found
-					for box in self.FAVLIST:
-						if box[1] == currarch:
-							boxlist.append((box[0], currarch))
-							textlist = [box[0], box[1], "unclear", "no server", "no server", "no server found", "no server found", "no server found", 0xFF0400, None]
-							baselist.append(textlist)
-							boxpix = self.imageDisplay(box)
-							if not boxpix:
-								boxpiclist.append(box[0])  # collect missing box pictures (avoids flickering in menu)
-				menulist.append(textlist[:-1] + [boxpix] + [None])  # remove last entry 'serverstatus' from textlist (no need for skin)
-			self["menu"].updateList(menulist)
+			self.updateMenulist()
 			self["red"].show()
 			self["key_red"].show()
-			self.baselist = baselist
-			self.boxlist = boxlist
-			for box in statuslist:  # download missing server status
-				callInThread(self.getServerStatus, box)
-			for boxname in boxpiclist:  # download missing box pictures
-				callInThread(self.imageDownload, boxname)
 		else:
 			self["red"].hide()
 			self["key_red"].hide()
 			self["menu"].style = "emptylist"
 			self["menu"].updateList([(_("No favorites (box, platform) set yet."), _("Please select favorite(s) in the image lists."))])
+		self.favversion = FAV.version
 		self["menu"].setIndex(self.currindex)
 		self.updateStatus()
 
-	def imageDownload(self, boxname):
-		try:
-			response = get(f"{self.PICURL}{boxname}.png".encode(), timeout=(3.05, 6))
-			response.raise_for_status()
-		except exceptions.RequestException as error:
-			print(f"[{self.MODULE_NAME}] ERROR in module 'imageDownload': {str(error)}")
-		else:
-			if exists(self.TEMPPATH):
-				with open(join(self.TEMPPATH, f"{boxname}.png"), "wb") as f:
-					f.write(response.content)
-		self.updateMenulist()
-
-	def imageDisplay(self, box):
-		picfile = join(self.TEMPPATH, f"{box[0]}.png")
-		return LoadPixmap(cached=True, path=picfile) if exists(picfile) else None
-
-	def updateMenulist(self):
+	def countdown(self):  # once a minute: counts the NextBuild cells down locally, refetches only if a build should have ended or data is too old
+		if any(self.isOutdated(timestamp, expires) for timestamp, expires in self.platexpiry.values()):
+			self.platexpiry = {}  # refresh is pending
+			EX.submit("list", self.createMenulist, FAV.snapshot(), CACHETIME)
+		elif self.deadlines and config.plugins.OpenATVstatus.nextbuild.value != "absolute":
+			for box, deadline in self.deadlines.items():
+				idx = self.rowindex.get(box)
+				if idx is not None:
+					self.baselist[idx][7] = self.fmtRemaining(deadline)
+			self.updateMenulist()
+
+	def imageDownloadCB(self, boxname):
+		DP.post(self, "redraw", self.updateMenulist)
+
+	def probeCB(self, streamurl, info):
+		DP.post(self, "redraw", self.updateMenulist)
+
+	def updateMenulist(self):  # works on decoded pixmaps in memory: no file system access, no decoding (except for pixmaps evicted in low-memory mode)
+		palette = {"online": 0x00B028, "offline": 0x808080}
 		menulist = []
 		for textlist in self.baselist:
-			picfile = join(self.TEMPPATH, f"{textlist[0]}.png")
-			boxpix = LoadPixmap(cached=True, path=picfile) if exists(picfile) else None
-			picfile = join(self.ICONPATH, textlist[9]) if textlist[9] else None
-			statuspix = LoadPixmap(cached=True, path=picfile) if picfile and exists(picfile) else None
-			menulist.append(tuple(textlist[:-1] + [boxpix] + [statuspix]))  # remove last entry 'serverstatus' from textlist (no need for skin)
+			boxpix = PC.lookup(PC.thumbPath(textlist[0]))
+			statuspix = PC.lookup(join(self.ICONPATH, textlist[9])) if textlist[9] else None
+			peer = PP.lookup(textlist[0])  # online/offline state of the box in the local network
+			peercolor = palette[peer[0]] if peer else 0xFFFFFF
+			menulist.append(tuple(textlist[:-1] + [boxpix] + [statuspix] + [peercolor]))  # remove last entry 'serverstatus' from textlist (no need for skin)
 		self["menu"].updateList(menulist)
 
 	def getServerStatus(self, box):
-		box = list(box)
-		if box[0]:
-			url = f"https://ampel.mynonpublic.com/status/index.php?boxname={box[0]}"
-			try:
-				response = get(url.encode(), timeout=(3.05, 6))
-				response.raise_for_status()
-			except exceptions.RequestException as error:
-				print(f"[{self.MODULE_NAME}] ERROR in module 'getServerStatus': {str(error)}")
-			else:
-				try:
-					htmldata = response.content.decode()
-					if htmldata:
-						server = search(r"src='(.*?)'/></center>", htmldata)
-						if server:
-							for idx in range(len(self.baselist)):
-								if box == self.baselist[idx][:2]:
-									self.baselist[idx][9] = server.group(1)  # replace last entry 'serverstatus'
-									self.updateMenulist()
-					self.error = f"[{self.MODULE_NAME}] ERROR in module 'getstatus': server access failed."
-				except Exception as err:
-					self.error = f"[{self.MODULE_NAME}] ERROR in module 'getstatus': invalid data from server {str(err)}"
-		else:
-			self.error = f"[{self.MODULE_NAME}] ERROR in module 'getstatus': missing boxname"
+		serverstatus = self.loadServerStatus(box[0])
+		if serverstatus:
+			DP.post(self, box, self.setServerStatus, box, serverstatus)
+			DP.post(self, "redraw", self.updateMenulist)
+
+	def setServerStatus(self, box, serverstatus):
+		idx = self.rowindex.get(box)
+		if idx is not None:
+			self.baselist[idx][9] = serverstatus  # replace last entry 'serverstatus'
 
 	def updateStatus(self):
-		if self.FAVLIST:
+		if FAV:
 			self.currindex = self["menu"].getSelectedIndex()
 			if self.boxlist and self.currindex is not None:
 				currplat = self.boxlist[self.currindex][1]
@@ -382,11 +935,18 @@ class ATVfavorites(Screen, ATVglobs):
 
 	def msgboxCB(self, answer):
 		if answer is True and self.boxlist and self.currindex is not None:
-			self.FAVLIST.remove(self.foundFavs[0])
-			config.plugins.OpenATVstatus.favboxes.value = ";".join(f"({','.join(item)})" for item in self.FAVLIST) if self.FAVLIST else ""
-			config.plugins.OpenATVstatus.favboxes.save()
 			removedbox = self.boxlist[self.currindex]
-			self.createMenulist()
+			FAV.remove(removedbox)
+			self.favversion = FAV.version
+			if FAV:  # drops the row only, neither refetches nor rebuilds the other rows
+				del self.boxlist[self.currindex]
+				del self.baselist[self.currindex]
+				self.rowindex = {box: index for index, box in enumerate(self.boxlist)}
+				self.updateMenulist()
+				self["menu"].setIndex(min(self.currindex, len(self.boxlist) - 1))
+				self.updateStatus()
+			else:
+				EX.submit("list", self.createMenulist, FAV.snapshot())
 			self.session.open(MessageBox, text=_("Box '%s-%s' was sucessfully removed from favorites!") % removedbox, type=MessageBox.TYPE_INFO, timeout=2, close_on_any_key=True)
 
 	def keyOk(self):
@@ -399,7 +959,6 @@ class ATVfavorites(Screen, ATVglobs):
 				return
 		else:
 			currbox = ("", BS.getplatform(config.plugins.OpenATVstatus.favarch.value))
-		self.oldfavlist = self.FAVLIST[:]
 		if currbox[1] in BS.platlist:
 			self.session.openWithCallback(self.ATVimageslistCB, ATVimageslist, currbox)
 
@@ -410,14 +969,12 @@ class ATVfavorites(Screen, ATVglobs):
 				self.session.open(ATVboxdetails, currbox)
 
 	def keyRed(self):
-		if self.boxlist and self.currindex is not None:
-			self.foundFavs = [item for item in self.FAVLIST if item == self.boxlist[self.currindex]]
-			if self.foundFavs:
-				self.session.openWithCallback(self.msgboxCB, MessageBox, _("Do you really want to remove Box '%s-%s' from favorites?") % self.boxlist[self.currindex], MessageBox.TYPE_YESNO, timeout=20, default=False)
+		if self.boxlist and self.currindex is not None and self.boxlist[self.currindex] in FAV:
+			self.session.openWithCallback(self.msgboxCB, MessageBox, _("Do you really want to remove Box '%s-%s' from favorites?") % self.boxlist[self.currindex], MessageBox.TYPE_YESNO, timeout=20, default=False)
 
 	def ATVimageslistCB(self):
-		if self.oldfavlist != self.FAVLIST:  # any changes when running 'ATVimageslist'?
-			self.createMenulist()
+		if self.favversion != FAV.version:  # any changes when running 'ATVimageslist'?
+			EX.submit("list", self.createMenulist, FAV.snapshot())
 
 	def keyUp(self):
 		self["menu"].up()
@@ -444,16 +1001,16 @@ class ATVfavorites(Screen, ATVglobs):
 		self.updateStatus()
 
 	def exit(self):
+		self.countdownTimer.stop()
 		BS.stop()
-		if exists(self.TEMPPATH):
-			rmtree(self.TEMPPATH)
+		PC.clear(self.TEMPPATH)  # the pictures are kept on disk: with the manifest only new or changed pictures will be downloaded next time
 		self.close()
 
 	def openConfig(self):
 		self.session.openWithCallback(self.openConfigCB, ATVconfig)
 
 	def openConfigCB(self):
-			self.createMenulist()
+			EX.submit("list", self.createMenulist, FAV.snapshot())
 
 
 class ATVimageslist(Screen, ATVglobs):
@@ -465,11 +1022,17 @@ class ATVimageslist(Screen, ATVglobs):
 		Screen.__init__(self, session, self.skin)
 		self.setTitle(_("Images list"))
 		self.boxlist = []
+		self.boxindex = {}
+		self.viewmodels = {}  # {platform: ImagesListModel}
 		self.htmldict = {}
-		self.platidx = BS.platlist.index(self.currplat)
+		self.result = None
+		self.expires = None  # estimated end of the current build of the shown platform
+		self.deadline = None  # estimated end of next build of the selected box
+		self.boxesahead = 0
+		self.platlist = BS.platlist  # the list 'platidx' refers to, 'BS.platlist' may be replaced meanwhile (see 'syncPlatlist')
+		self.platidx = self.platlist.index(self.currplat)
 		self.currindex = 0
 		self.favindex = 0
-		self.foundFavs = []
 		self["prev_plat"] = Label()
 		self["curr_plat"] = Label()
 		self["next_plat"] = Label()
@@ -484,6 +1047,7 @@ class ATVimageslist(Screen, ATVglobs):
 		self["key_red"] = Label()
 		self["key_green"] = Label(_("jump to construction site"))
 		self["key_yellow"] = Label(_("jump to favorite(s)"))
+		self["key_blue"] = Label(_("search box"))
 		self["key_ok"] = Label(_("Boxdetails"))
 		self["key_menu"] = Label(_("Settings"))
 		self["actions"] = ActionMap(["WizardActions",
@@ -496,6 +1060,7 @@ class ATVimageslist(Screen, ATVglobs):
 													"red": self.keyRed,
 													"green": self.keyGreen,
 													"yellow": self.keyYellow,
+													"blue": self.openSearch,
 													"up": self.keyUp,
 													"down": self.keyDown,
 													"right": self.keyPageDown,
@@ -509,8 +1074,19 @@ class ATVimageslist(Screen, ATVglobs):
 													}, -1)
 		delay = int(config.plugins.OpenATVstatus.animate.value)
 		self.CS = Carousel(delay if delay else 50)
-		self.CS.start(BS.platlist, self.platidx, self.CarouselCB)
+		self.CS.start(self.platlist, self.platidx, self.CarouselCB)
+		self.prefetchlist = []
+		self.picturesloaded = set()  # platforms whose box pictures around the selection have been requested
+		self.loading = False
+		self.generation = 0  # only results of the newest fetch request will be applied
+		self.debounceTimer = eTimer()
+		self.debounceTimer.callback.append(self.refreshplatlist)
+		self.prefetchTimer = eTimer()
+		self.prefetchTimer.callback.append(self.prefetchNext)
+		self.countdownTimer = eTimer()
+		self.countdownTimer.callback.append(self.countdown)
 		self.onLayoutFinish.append(self.onLayoutFinished)
+		DP.attach(self)
 
 	def onLayoutFinished(self):
 		self["prev_label"].setText(_("previous"))
@@ -519,51 +1095,120 @@ class ATVimageslist(Screen, ATVglobs):
 		self["menu"].setList([])
 		self.setPlatformStatic()
 		self.refreshplatlist()
+		self.countdownTimer.start(self.COUNTDOWNDELAY, False)
+
+	def requestRefresh(self):  # debounced 'refreshplatlist': already fetched platforms will be shown at once
+		self.generation += 1  # outdate all pending requests
+		self.loading = True
+		self.prefetchTimer.stop()
+		self.debounceTimer.stop()
+		self.syncPlatlist()
+		if BS.getcached(self.platlist[self.platidx]):
+			self.refreshplatlist()
+		else:
+			self.debounceTimer.start(self.DEBOUNCEDELAY, True)
 
 	def refreshplatlist(self):
-		self.currplat = BS.platlist[self.platidx]
-		BS.getbuildinfos(BS.platlist[self.platidx], callback=self.refreshCallback)
-
-	def refreshCallback(self, htmldict):
-		self.htmldict = htmldict  # for updateList in case config will be changed
+		self.debounceTimer.stop()
+		self.syncPlatlist()
+		self.currplat = self.platlist[self.platidx]
+		self.loading = True
+		self.generation += 1
+		generation = self.generation
+		self.schedulePrefetch()
+		BS.fetchasync(self.currplat, lambda result: DP.post(self, "refresh", self.refreshCallback, result, generation), cancelled=lambda: generation != self.generation)
+
+	def refreshCallback(self, result, generation=None):
+		if (generation is not None and generation != self.generation) or result.platform != self.currplat:
+			return  # outdated result of a superseded platform
+		self.loading = False
+		if result.error:
+			print(result.error)
+		self.result = result  # evaluations work on this immutable result only
+		self.htmldict = result.htmldict  # for updateList in case config will be changed
+		self.expires = result.expires()
 		self.makeimagelist()
 
+	def countdown(self):  # once a minute: counts the ETA of the selected box down locally, refetches only if a build should have ended or data is too old
+		if self.result is None or self.loading:
+			return
+		if self.isOutdated(self.result.timestamp, self.expires):
+			if self.boxlist and self.currindex is not None:
+				self.currbox = self.boxlist[self.currindex]  # a refresh keeps the selected box
+			self.refreshplatlist()
+		elif self.boxlist and self.deadline is not None:
+			self["boxinfo"].setText(_("Next build ends in %s, still %s boxes ahead") % (self.fmtRemaining(self.deadline), self.boxesahead))
+
+	def schedulePrefetch(self):  # speculative prefetch of neighbouring platforms and favorites' platforms
+		self.prefetchTimer.stop()  # cancel pending prefetches of the former platform
+		platcount = len(self.platlist)
+		prefetchlist = [self.platlist[(self.platidx + 1) % platcount], self.platlist[(self.platidx - 1) % platcount]]
+		if FAV:  # platforms 'keyYellow' will jump to
+			favlist = FAV.list()
+			favindex = (self.favindex + 1) % len(favlist)
+			prefetchlist += [item[1] for item in favlist[favindex:] + favlist[:favindex]]
+		self.prefetchlist = []
+		for platform in prefetchlist:
+			if platform != self.currplat and platform in self.platlist and platform not in self.prefetchlist:
+				self.prefetchlist.append(platform)
+		self.prefetchTimer.start(self.PREFETCHDELAY, False)
+
+	def prefetchNext(self):  # rate limited: one platform per timer tick and only when current platform has been loaded
+		if self.loading:
+			return
+		while self.prefetchlist:
+			platform = self.prefetchlist.pop(0)
+			if not BS.getcached(platform):
+				EX.submit("prefetch", BS.prefetch, platform)
+				return
+		self.prefetchTimer.stop()
+		if self.boxlist and self.currplat not in self.picturesloaded and not self.MEMBUDGET:  # box pictures around the selection and of the favorites on the platform the user stays on, for the box details
+			self.picturesloaded.add(self.currplat)
+			index = self.currindex or 0
+			nearby = [box[0] for box in self.boxlist[max(0, index - self.PREFETCHBOXES):index + self.PREFETCHBOXES + 1]]
+			EX.submit("prefetch", PC.downloadAll, list(dict.fromkeys(nearby + list(FAV.boxnames(self.currplat)))))  # not all pictures of the platform: they are kept in TEMPPATH (tmpfs)
+
 	def makeimagelist(self):
-		menulist = []
-		boxlist = []
 		if self.htmldict:
-			for boxname in self.htmldict["boxinfo"]:
-				boxlist.append((boxname, self.currplat))
-				bd = self.htmldict["boxinfo"][boxname]
-				palette = {"Building": 0x00B028, "Failed": 0xFF0400, "Complete": 0xB0B0B0, "Waiting": 0xFFAE00}
-				color = 0xFDFf00 if [item for item in self.FAVLIST if item == (boxname, self.currplat)] else palette.get(bd["BuildStatus"], 0xB0B0B0)
-				buildtime = self.roundMinutes(bd["BuildTime"].strip())
-				synctime = self.roundMinutes(bd["SyncTime"].strip())
-				menulist.append(tuple([bd["No"], boxname, bd["BuildStatus"], self.fmtDateTime(bd["StartBuild"]), self.fmtDateTime(bd["StartFeedSync"]), self.fmtDateTime(bd["EndBuild"]), synctime, buildtime, color]))
-			self["menu"].updateList(menulist)
-			self.boxlist = boxlist
+			viewmodel = self.viewmodels.get(self.currplat)
+			if viewmodel is None:
+				viewmodel = self.viewmodels[self.currplat] = ImagesListModel()
+				if self.MEMBUDGET:  # low-memory mode: view models are kept only for platforms whose data is still cached
+					for platform in [platform for platform in self.viewmodels if platform != self.currplat and platform not in BS.platcache]:
+						del self.viewmodels[platform]
+			self["menu"].updateList(viewmodel.update(self.result, FAV))
+			self.boxlist = viewmodel.boxlist
+			self.boxindex = viewmodel.boxindex
+		else:  # platform could not be loaded: don't keep the boxes of the former platform
+			self.boxlist = []
+			self.boxindex = {}
+			self["menu"].updateList([])
+			self["boxinfo"].setText("")
+			self["platinfo"].setText(_("Platform data not available, server access failed."))
 		if self.currbox:
-			foundbox = [item for item in boxlist if item == self.currbox]
-			if foundbox:
-				self["menu"].setIndex(self.boxlist.index(foundbox[0]))
+			index = self.boxindex.get(self.currbox)
+			if index is not None:
+				self["menu"].setIndex(index)
 			self.currbox = None
 		self.updateStatus()
 
 	def updateStatus(self):
 		self.currindex = self["menu"].getSelectedIndex()
 		if self.boxlist and self.currindex is not None:
-			if [item for item in self.FAVLIST if item == self.boxlist[self.currindex]]:
+			if self.boxlist[self.currindex] in FAV:
 				self["key_red"].setText(_("remove box from favorites"))
 			else:
 				self["key_red"].setText(_("add box to favorites"))
 			currbox = self.boxlist[self.currindex][0]
-			nextbuild, boxesahead, cycletime, counter, failed = BS.evaluate(currbox)
-			if BS.findbuildbox():
-				boxinfo = _("Next build ends in %s, still %s boxes ahead") % (f"{BS.strf_delta(nextbuild)[:5]} h", boxesahead)
+			nextbuild, boxesahead, cycletime, counter, failed = self.result.evaluate(currbox)
+			if self.result.findbuildbox():  # ETA counts from fetch time (the data may have been cached for a while)
+				self.deadline, self.boxesahead = self.result.timestamp + nextbuild.total_seconds(), boxesahead
+				boxinfo = _("Next build ends in %s, still %s boxes ahead") % (self.fmtRemaining(self.deadline), boxesahead)
 			else:
+				self.deadline = None
 				boxinfo = _("Server paused, unclear how many boxes are ahead...")
-			buildstatus = BS.htmldict["boxinfo"][self.boxlist[self.currindex][0]]["BuildStatus"] if BS.htmldict else ""
-			nextbuild = self.fmtDateTime((datetime.now(tz=ZoneInfo("Europe/Berlin")) + nextbuild).strftime("%Y/%m/%d, %H:%M:%S")) if config.plugins.OpenATVstatus.nextbuild.value == "absolute" and nextbuild else f"{BS.strf_delta(nextbuild)[:5]} h"
+			buildstatus = self.htmldict["boxinfo"][currbox]["BuildStatus"] if self.htmldict else ""
+			nextbuild = self.fmtDateTime((self.serverNow() + nextbuild).strftime("%Y/%m/%d, %H:%M:%S")) if config.plugins.OpenATVstatus.nextbuild.value == "absolute" and nextbuild else f"{BS.strf_delta(nextbuild)[:5]} h"
 			if nextbuild:
 				self["boxinfo"].setText(boxinfo)
 			elif buildstatus == "Building":
@@ -579,29 +1224,39 @@ class ATVimageslist(Screen, ATVglobs):
 				self["menu"].setList([])
 
 	def nextPlatform(self):
-		self.platidx = (self.platidx + 1) % len(BS.platlist)
+		self.syncPlatlist()
+		self.platidx = (self.platidx + 1) % len(self.platlist)
 		delay = int(config.plugins.OpenATVstatus.animate.value)
 		if delay:
 			self.CS.setDelay(delay)  # in case it has changed
 			self.CS.turnForward()
 		else:
 			self.setPlatformStatic()
-		self.refreshplatlist()
+		self.requestRefresh()
 
 	def prevPlatform(self):
-		self.platidx = (self.platidx - 1) % len(BS.platlist)
+		self.syncPlatlist()
+		self.platidx = (self.platidx - 1) % len(self.platlist)
 		delay = int(config.plugins.OpenATVstatus.animate.value)
 		if delay:
 			self.CS.setDelay(delay)  # in case it has changed
 			self.CS.turnBackward()
 		else:
 			self.setPlatformStatic()
-		self.refreshplatlist()
+		self.requestRefresh()
 
 	def setPlatformStatic(self):
-		self["prev_plat"].setText(BS.platlist[self.platidx - 1] if self.platidx > 0 else BS.platlist[len(BS.platlist) - 1])
-		self["curr_plat"].setText(BS.platlist[self.platidx])
-		self["next_plat"].setText(BS.platlist[self.platidx + 1] if self.platidx < len(BS.platlist) - 1 else BS.platlist[0])
+		self.syncPlatlist()
+		self["prev_plat"].setText(self.platlist[self.platidx - 1] if self.platidx > 0 else self.platlist[len(self.platlist) - 1])
+		self["curr_plat"].setText(self.platlist[self.platidx])
+		self["next_plat"].setText(self.platlist[self.platidx + 1] if self.platidx < len(self.platlist) - 1 else self.platlist[0])
+
+	def syncPlatlist(self):  # the platform list was replaced (e.g. by the check of 'content.json'): finds the shown platform again by name
+		if self.platlist is not BS.platlist and BS.platlist:
+			platform = self.platlist[self.platidx]
+			self.platlist = BS.platlist
+			self.platidx = self.platlist.index(platform) if platform in self.platlist else min(self.platidx, len(self.platlist) - 1)
+			self.CS.start(self.platlist, self.platidx, self.CarouselCB)
 
 	def CarouselCB(self, rotated):
 		self["prev_plat"].setText(rotated[0])
@@ -616,42 +1271,39 @@ class ATVimageslist(Screen, ATVglobs):
 
 	def msgboxCB(self, answer):
 		if answer is True and self.boxlist and self.currindex is not None:
-			self.FAVLIST.remove(self.foundFavs[0])
-			config.plugins.OpenATVstatus.favboxes.value = ";".join(f"({','.join(item)})" for item in self.FAVLIST) if self.FAVLIST else ""
-			config.plugins.OpenATVstatus.favboxes.save()
+			FAV.remove(self.boxlist[self.currindex])
 			self.session.open(MessageBox, text=_("Box '%s-%s' was sucessfully removed from favorites!") % self.boxlist[self.currindex], type=MessageBox.TYPE_INFO, timeout=2, close_on_any_key=True)
-			self.refreshplatlist()
+			self.makeimagelist()  # recolors the favorites only
 
 	def keyRed(self):
 		if self.boxlist and self.currindex is not None:
-			self.foundFavs = [item for item in self.FAVLIST if item == self.boxlist[self.currindex]]
-			if self.foundFavs:
+			if self.boxlist[self.currindex] in FAV:
 				self.session.openWithCallback(self.msgboxCB, MessageBox, _("Do you really want to remove Box '%s-%s' from favorites?") % self.boxlist[self.currindex], MessageBox.TYPE_YESNO, timeout=20, default=False)
 			else:
-				self.FAVLIST.append(self.boxlist[self.currindex])
-				config.plugins.OpenATVstatus.favboxes.value = ";".join(f"({','.join(item)})" for item in self.FAVLIST) if self.FAVLIST else ""
-				config.plugins.OpenATVstatus.favboxes.save()
+				FAV.add(self.boxlist[self.currindex])
 				self.session.open(MessageBox, text=_("Box '%s-%s' was sucessfully added to favorites!") % self.boxlist[self.currindex], type=MessageBox.TYPE_INFO, timeout=2, close_on_any_key=True)
-				self.refreshplatlist()
+				self.makeimagelist()  # recolors the favorites only
 
 	def keyGreen(self):
 		if self.boxlist:
-			findbuildbox = (BS.findbuildbox(), self.currplat)
-			if findbuildbox[0]:
-				self["menu"].setIndex(self.boxlist.index(findbuildbox))
+			findbuildbox = (self.result.findbuildbox(), self.currplat)
+			if findbuildbox in self.boxindex:
+				self["menu"].setIndex(self.boxindex[findbuildbox])
 				self.updateStatus()
 			else:
 				self.session.open(MessageBox, text=_("At the moment no image is built on the platform '%s'!") % self.currplat, type=MessageBox.TYPE_INFO, timeout=5, close_on_any_key=True)
 
 	def keyYellow(self):
-		if self.boxlist and self.FAVLIST:
-			self.favindex = (self.favindex + 1) % len(self.FAVLIST)
-			self.currbox = self.FAVLIST[self.favindex]
-			if self.currbox in self.boxlist:
-				self["menu"].setIndex(self.boxlist.index(self.currbox))
+		if self.boxlist and FAV:
+			favlist = FAV.list()
+			self.favindex = (self.favindex + 1) % len(favlist)
+			self.currbox = favlist[self.favindex]
+			if self.currbox in self.boxindex:
+				self["menu"].setIndex(self.boxindex[self.currbox])
 				self.updateStatus()
-			else:
-				self.platidx = BS.platlist.index(self.currbox[1])
+			elif self.currbox[1] in BS.platlist:
+				self.syncPlatlist()
+				self.platidx = self.platlist.index(self.currbox[1])
 				self.CS.moveToIndex(self.platidx)
 				self.setPlatformStatic()
 				self.refreshplatlist()
@@ -681,6 +1333,11 @@ class ATVimageslist(Screen, ATVglobs):
 		self.updateStatus()
 
 	def exit(self):
+		self.generation += 1  # drop all pending results
+		self.debounceTimer.stop()
+		self.prefetchTimer.stop()
+		self.countdownTimer.stop()
+		self.prefetchlist = []
 		self.CS.stop()
 		self.close()
 
@@ -690,6 +1347,168 @@ class ATVimageslist(Screen, ATVglobs):
 	def openConfigCB(self):
 		self.makeimagelist()
 
+	def openSearch(self):
+		self.session.openWithCallback(self.openSearchCB, ATVsearch)
+
+	def openSearchCB(self, box=None):
+		if box:  # jump to the found box
+			self.currbox = box
+			if box in self.boxindex:
+				self["menu"].setIndex(self.boxindex[box])
+				self.currbox = None
+				self.updateStatus()
+			else:
+				self.syncPlatlist()
+				self.platidx = self.platlist.index(box[1])
+				self.CS.moveToIndex(self.platidx)
+				self.setPlatformStatic()
+				self.refreshplatlist()
+
+
+class ATVsearch(Screen, ATVglobs):  # type-ahead search for box and OEM names over all platforms
+	def __init__(self, session):
+		self.session = session
+		self.skin = self.readSkin("ATVsearch")
+		Screen.__init__(self, session, self.skin)
+		self.setTitle(_("Search box"))
+		self.boxlist = []
+		self.closed = False
+		self["version"] = Label(self.VERSION)
+		self["curr_date"] = Label(datetime.now().strftime("%x"))
+		self["input"] = Input(text="", maxSize=False, type=Input.TEXT)
+		self["searchinfo"] = Label()
+		self["menu"] = List([])
+		self["key_red"] = Label(_("Cancel"))
+		self["key_ok"] = Label(_("Images list"))
+		self["key_info"] = Label(_("Boxdetails"))
+		self["actions"] = NumberActionMap(["WizardActions",
+										"DirectionActions",
+										"ColorActions",
+										"InputBoxActions",
+										"InputAsciiActions",
+										"KeyboardInputActions"], {"ok": self.keyOk,
+																"back": self.exit,
+																"cancel": self.exit,
+																"red": self.exit,
+																"info": self.keyInfo,
+																"up": self.keyUp,
+																"down": self.keyDown,
+																"left": self.keyLeft,
+																"right": self.keyRight,
+																"home": self.keyHome,
+																"end": self.keyEnd,
+																"deleteForward": self.keyDelete,
+																"deleteBackward": self.keyBackspace,
+																"gotAsciiCode": self.keyGotAscii,
+																"1": self.keyNumber,
+																"2": self.keyNumber,
+																"3": self.keyNumber,
+																"4": self.keyNumber,
+																"5": self.keyNumber,
+																"6": self.keyNumber,
+																"7": self.keyNumber,
+																"8": self.keyNumber,
+																"9": self.keyNumber,
+																"0": self.keyNumber
+																}, -1)
+		self.onExecBegin.append(self.setKeyboardModeAscii)
+		self.onExecEnd.append(self.setKeyboardModeNone)
+		self.onLayoutFinish.append(self.onLayoutFinished)
+		DP.attach(self)
+
+	def onLayoutFinished(self):
+		self.updateSearch()
+		indexed = BS.boxindex.platforms()
+		for platform in BS.platlist:  # the index grows while the remaining platforms are loaded in background
+			if platform not in indexed:
+				EX.submit("prefetch", self.indexPlatform, platform)
+
+	def indexPlatform(self, platform):
+		if not self.closed:
+			BS.prefetch(platform)  # updates the index
+			DP.post(self, "indexed", self.indexedCB)  # platforms indexed within one frame refresh the results only once
+
+	def indexedCB(self):
+		if not self.closed:
+			self.updateSearch()
+
+	def updateSearch(self):
+		text = self["input"].getText()
+		absolute = config.plugins.OpenATVstatus.nextbuild.value == "absolute"
+		menulist = []
+		self.boxlist = []
+		for platform, boxname in BS.boxindex.search(text, limit=200):
+			found = BS.boxindex.lookup(platform, boxname)
+			if found is None:  # platform was evicted since the search
+				continue
+			result, nextbuild = found[:2]
+			bd = result.htmldict["boxinfo"][boxname]
+			if nextbuild is None:
+				nextbuild = _("server paused")
+			else:  # ETA counts from fetch time (the data may have been cached for a while)
+				deadline = result.timestamp + nextbuild.total_seconds()
+				nextbuild = self.fmtDateTime((self.serverNow() + timedelta(seconds=max(0, deadline - time()))).strftime("%Y/%m/%d, %H:%M:%S")) if absolute and nextbuild else self.fmtRemaining(deadline)
+			menulist.append((boxname, bd["OemName"], platform, bd["BuildStatus"], nextbuild, ImagesListModel.PALETTE.get(bd["BuildStatus"], 0xB0B0B0)))
+			self.boxlist.append((boxname, platform))
+		self["menu"].updateList(menulist)
+		indexed = len(BS.boxindex.platforms())
+		self["searchinfo"].setText(f"{len(menulist)} {_('boxes found')}, {indexed}/{len(BS.platlist)} {_('platforms searched')}" if text.strip() else _("Enter part of a box or OEM name"))
+
+	def setKeyboardModeAscii(self):
+		eRCInput.getInstance().setKeyboardMode(eRCInput.kmAscii)
+
+	def setKeyboardModeNone(self):
+		eRCInput.getInstance().setKeyboardMode(eRCInput.kmNone)
+
+	def keyGotAscii(self):
+		self["input"].handleAscii(getPrevAsciiCode())
+		self.updateSearch()
+
+	def keyNumber(self, number):
+		self["input"].number(number)
+		self.updateSearch()
+
+	def keyBackspace(self):
+		self["input"].deleteBackward()
+		self.updateSearch()
+
+	def keyDelete(self):
+		self["input"].delete()
+		self.updateSearch()
+
+	def keyLeft(self):
+		self["input"].left()
+
+	def keyRight(self):
+		self["input"].right()
+
+	def keyHome(self):
+		self["input"].home()
+
+	def keyEnd(self):
+		self["input"].end()
+
+	def keyUp(self):
+		self["menu"].up()
+
+	def keyDown(self):
+		self["menu"].down()
+
+	def keyOk(self):
+		index = self["menu"].getSelectedIndex()
+		if self.boxlist and index is not None:
+			self.closed = True
+			self.close(self.boxlist[index])
+
+	def keyInfo(self):
+		index = self["menu"].getSelectedIndex()
+		if self.boxlist and index is not None:
+			self.session.open(ATVboxdetails, self.boxlist[index])
+
+	def exit(self):
+		self.closed = True
+		self.close()
+
 
 class ATVboxdetails(Screen, ATVglobs):
 	def __init__(self, session, box):
@@ -710,7 +1529,9 @@ class ATVboxdetails(Screen, ATVglobs):
 													"cancel": self.exit,
 													"red": self.exit,
 													}, -1)
+		self.closed = False
 		self.onLayoutFinish.append(self.onLayoutFinished)
+		DP.attach(self)
 
 	def onLayoutFinished(self):
 		self["picture"].hide()
@@ -718,54 +1539,47 @@ class ATVboxdetails(Screen, ATVglobs):
 		if exists(self.picfile):
 			self.idownloadCB()
 		else:
-			callInThread(self.imageDownload, self.box[0])
-		status = "offline"
-		details = ""
+			EX.submit("picture", self.imageDownload, self.box[0])
 		if self.box[0] == BoxInfo.getItem("BoxName"):
-			status = "online"
-			details += f"{_('Model')}:\t{BoxInfo.getItem('displaymodel')}\n"
+			details = f"{_('Model')}:\t{BoxInfo.getItem('displaymodel')}\n"
 			details += f"{_('Brand')}:\t{BoxInfo.getItem('displaybrand')}\n"
 			details += f"{_('Image')}:\t{BoxInfo.getItem('displaydistro')}\n"
 			details += f"{_('Version')}:\t{BoxInfo.getItem('imageversion')}.{BoxInfo.getItem('imgrevision')}\n"
 			details += f"{_('Chipset')}:\t{BoxInfo.getItem('socfamily')}\n"
+			self["status"].setText("online")
 			self["details"].setText(details)
 		else:
-			streamurls = getPeerStreamingBoxes()
-			if streamurls:
-				streamurl = [x for x in streamurls if self.box[0] in x]  # example streamurls: ['http://gbue4k.local:8001', 'http://sf8008.local:8001']
-				bd = self.getAPIdata(f"{streamurl[0][:streamurl[0].rfind(':')]}:80/api/about") if streamurl else None
-				if bd and bd["info"]:
-					status = "online"
-					details += f"{_('Model')}:\t{bd.get('info', {}).get('model', '')}\n"
-					details += f"{_('Brand')}:\t{bd.get('info', {}).get('brand', '')}\n"
-					details += f"{_('Image')}:\t{bd.get('info', {}).get('friendlyimagedistro', '')}\n"
-					details += f"{_('Version')}:\t{bd.get('info', {}).get('imagever', '')}\n"
-					details += f"{_("Chipset")}:\t{bd.get("info", {}).get("chipset", "")}h\n"
-					self["status"].setText("online")
-		if not details:
-			details += f"{_('Model')}:\t{self.box[0]}\n"
+			peer = PP.lookup(self.box[0])
+			if peer:  # known online/offline state: show at once
+				self.showPeer(*peer)
+			else:  # screen renders immediately, details will be filled in as they arrive
+				self["status"].setText("...")
+				self["details"].setText(f"{_('Model')}:\t{self.box[0]}\n")
+				PP.probe(self.probeCB)
+
+	def probeCB(self, streamurl, info):
+		if self.closed:
+			return
+		peer = PP.lookup(self.box[0])
+		if peer and (peer[0] == "online" or not PP.probing):  # wait for all probes before stating 'offline'
+			self.showPeer(*peer)
+
+	def showPeer(self, status, info):
+		if info:
+			details = f"{_('Model')}:\t{info.get('model', '')}\n"
+			details += f"{_('Brand')}:\t{info.get('brand', '')}\n"
+			details += f"{_('Image')}:\t{info.get('friendlyimagedistro', '')}\n"
+			details += f"{_('Version')}:\t{info.get('imagever', '')}\n"
+			details += f"{_('Chipset')}:\t{info.get('chipset', '')}\n"
+		else:
+			details = f"{_('Model')}:\t{self.box[0]}\n"
 			details += f"\n{_('Box is OFFLINE! No current details available')}"
 		self["status"].setText(status)
 		self["details"].setText(details)
 
-	def getAPIdata(self, apiurl):
-		try:
-			response = get(apiurl, timeout=(3.05, 6))
-			response.raise_for_status()
-			return loads(response.content)
-		except exceptions.RequestException as error:
-			print(f"[{self.MODULE_NAME}] ERROR in module 'getAPIdata': {str(error)}")
-
 	def imageDownload(self, boxname):
-		try:
-			response = get(f"{self.PICURL}{boxname}.png".encode(), timeout=(3.05, 6))
-			response.raise_for_status()
-		except exceptions.RequestException as error:
-			print(f"[{self.MODULE_NAME}] ERROR in module 'imageDownload': {str(error)}")
-		else:
-			with open(join(self.TEMPPATH, f"{boxname}.png"), "wb") as f:
-				f.write(response.content)
-		self.idownloadCB()
+		PC.download(boxname)  # the thumbnail will be used by the favorites' list
+		DP.post(self, "picture", self.idownloadCB)
 
 	def idownloadCB(self):
 		self["picture"].instance.setPixmapScaleFlags(BT_SCALE | BT_KEEP_ASPECT_RATIO | BT_HALIGN_CENTER | BT_VALIGN_CENTER)
@@ -773,6 +1587,7 @@ class ATVboxdetails(Screen, ATVglobs):
 		self["picture"].show()
 
 	def exit(self):
+		self.closed = True
 		self.close()
 
 
@@ -798,7 +1613,9 @@ class ATVconfig(ConfigListScreen, Screen, ATVglobs):
 		clist.append(getConfigListEntry(_("Time indication of 'NextBuild':"), config.plugins.OpenATVstatus.nextbuild, _("Show 'NextBuild' as relative time in hours or as absolute time.")))
 		clist.append(getConfigListEntry(_("Time zone:"), config.plugins.OpenATVstatus.timezone, _("Show time as local time or as standard time (UTC) from server.")))
 		clist.append(getConfigListEntry(_("Date format:"), config.plugins.OpenATVstatus.dateformat, _("Show date in desired format.")))
+		clist.append(getConfigListEntry(_("Memory budget:"), config.plugins.OpenATVstatus.membudget, _("Limits the memory of all caches, e.g. for receivers with little RAM. In standby all caches will be released then.")))
 		self["config"].setList(clist)
+		self["memoryinfo"] = Label(f"{_('Memory use')}: {self.fmtMemoryUse()}")
 
 	def keyGreen(self):
 		config.plugins.OpenATVstatus.save()
@@ -810,13 +1627,178 @@ class ATVconfig(ConfigListScreen, Screen, ATVglobs):
 		self.close()
 
 
+class ATVoverview(Screen, ATVglobs):  # all platforms at a glance: opens from cached summaries, outdated platforms are refreshed in background
+	def __init__(self, session):
+		self.session = session
+		self.skin = self.readSkin("ATVoverview")
+		Screen.__init__(self, session, self.skin)
+		self.setTitle(_("Overview"))
+		self.platlist = []
+		self.closed = False
+		self["version"] = Label(self.VERSION)
+		self["curr_date"] = Label(datetime.now().strftime("%x"))
+		self["overviewinfo"] = Label()
+		self["menu"] = List([])
+		self["key_red"] = Label(_("Cancel"))
+		self["key_ok"] = Label(_("Images list"))
+		self["actions"] = ActionMap(["OkCancelActions",
+									"ColorActions"], {"ok": self.keyOk,
+													"cancel": self.exit,
+													"red": self.exit
+													}, -1)
+		self.onLayoutFinish.append(self.onLayoutFinished)
+		DP.attach(self)
+
+	def onLayoutFinished(self):
+		self.updateOverview()
+		summaries = BS.getsummaries()
+		for platform in BS.platlist:
+			if platform not in summaries or time() - summaries[platform].timestamp >= CACHETIME:
+				EX.submit("list", self.refreshPlatform, platform)
+
+	def refreshPlatform(self, platform):
+		if not self.closed:
+			BS.fetch(platform)  # updates the platform's summary
+			DP.post(self, "overview", self.updateOverview)  # platforms refreshed within one frame redraw the list only once
+
+	def updateOverview(self):
+		summaries = BS.getsummaries()
+		menulist = []
+		building, failed = 0, 0
+		for platform in BS.platlist:
+			summary = summaries.get(platform)
+			if summary:
+				color = 0xFFFFFF if time() - summary.timestamp < self.REFRESHAGE else 0xB0B0B0  # summaries of a former session are greyed until refreshed
+				menulist.append((platform, summary.buildbox or _("server paused"), f"{summary.queue}", f"{summary.failed}", f"{BS.strf_delta(timedelta(seconds=summary.cycletime))[:5]} h", datetime.fromtimestamp(summary.timestamp).strftime("%H:%M"), color))
+				building += bool(summary.buildbox)
+				failed += summary.failed
+			else:
+				menulist.append((platform, _("unclear"), "", "", "", "", 0xB0B0B0))
+		self.platlist = BS.platlist
+		self["menu"].updateList(menulist)
+		self["overviewinfo"].setText(f"{len(self.platlist)} {_('platforms')}, {building} {_('building')}, {_('failed')}: {failed}")
+
+	def keyOk(self):
+		index = self["menu"].getSelectedIndex()
+		if self.platlist and index is not None:
+			self.session.open(ATVimageslist, ("", self.platlist[index]))
+
+	def exit(self):
+		self.closed = True
+		BS.writesummaries()  # the next overview opens at once, even in a new session
+		self.close()
+
+
+class Warmup(ATVglobs):  # low-priority session-start warmup: the first 'ATVfavorites' renders from memory
+	def __init__(self):
+		self.steps = []  # pending steps: [(func, args), ...]
+		self.generation = 0  # steps of a stopped warmup will be dropped
+
+	def start(self):
+		self.generation += 1
+		self.steps = [(self.loadPlatforms, (FAV.snapshot(),))]
+		self.next(self.generation)
+
+	def stop(self):
+		self.generation += 1
+		self.steps = []
+
+	def next(self, generation):  # one step per task: any screen's work is served first, because 'prefetch' is the lowest priority
+		if generation == self.generation and self.steps:
+			EX.submit("prefetch", self.step, generation)
+
+	def step(self, generation):
+		if generation != self.generation:
+			return  # stopped (e.g. standby)
+		func, args = self.steps.pop(0)
+		try:
+			func(*args)
+		except Exception as error:
+			print(f"[{self.MODULE_NAME}] ERROR in module 'warmup': {str(error)}")
+		self.next(generation)
+
+	def loadPlatforms(self, favorites):
+		if not BS.platlist:
+			BS.quickstart(favorites[0][0] if favorites else None)
+		if BS.platlist:
+			callFromThread(bootstrap)  # completes config choices on the reactor thread
+			self.steps += [(self.loadPlatform, (currarch, boxnames)) for currarch, boxnames in favorites]
+
+	def loadPlatform(self, currarch, boxnames):  # favorites' platform, then missing server status and box pictures of its favorites
+		result = BS.fetch(self.resolvePlatform(currarch), self.REFRESHAGE)
+		for boxname in boxnames:
+			if result.hasbox(boxname) and not self.getCachedStatus(boxname):
+				self.steps.append((self.loadServerStatus, (boxname,)))
+			thumbfile = PC.thumbPath(boxname)
+			PC.get(thumbfile) or PC.decode(thumbfile)  # decodes pictures already on disk
+		self.steps.append((PC.downloadAll, (boxnames,)))
+
+	def standbyCounterChanged(self, configelement):
+		from Screens.Standby import inStandby
+		self.stop()
+		if self.MEMBUDGET:
+			releaseMemory()
+		if inStandby:
+			inStandby.onClose.append(self.start)  # warm up again after leaving standby
+
+
+WU = Warmup()
+
+
+def applyBudget(configelement):  # splits the memory budget among all caches, entries beyond it are evicted at once
+	ATVglobs.MEMBUDGET = membudget = int(configelement.value) * 1048576
+	shares = ATVglobs.BUDGETSHARES
+	BS.setbudget(int(membudget * shares["platforms"]))
+	with PC.lock:
+		PC.pixmaps.shrink(int(membudget * shares["pictures"]))
+	PC.filebudget = int(membudget * shares["files"])
+	if membudget:
+		EX.submit("prefetch", PC.evictFiles)
+	with ATVglobs.CACHELOCK:
+		ATVglobs.STATUSCACHE.shrink(int(membudget * shares["status"]))
+	with PP.lock:
+		PP.peers.shrink(int(membudget * shares["peers"]))
+
+
+def releaseMemory():  # low-memory mode in standby: frees all caches, the data on disk (platform list, summaries, box pictures) is kept
+	BS.release()
+	PC.release()
+	with ATVglobs.CACHELOCK:
+		ATVglobs.STATUSCACHE.clear()
+	with PP.lock:
+		PP.peers.clear()
+	ATVglobs.SKINCACHE.clear()
+	print(f"[{WU.MODULE_NAME}] caches released for standby: {WU.fmtMemoryUse()}")
+
+
+config.plugins.OpenATVstatus.membudget.addNotifier(applyBudget)  # initial call applies the saved budget
+
+
 def main(session, **kwargs):
+		bootstrap()
 		session.open(ATVfavorites)
 
 
+def overview(session, **kwargs):
+		bootstrap()
+		session.open(ATVoverview)
+
+
 def autostart(reason, **kwargs):
-	pass
+	if reason == 1:  # enigma2 shuts down
+		WU.stop()
+		BS.writesummaries()
+
+
+def sessionstart(reason, session=None, **kwargs):
+	if reason == 0 and session:
+		config.misc.standbyCounter.addNotifier(WU.standbyCounterChanged, initial_call=False)
+		if FAV:
+			WU.start()
 
 
 def Plugins(**kwargs):
-	return PluginDescriptor(name="OpenATV Status", icon="plugin.png", description=_("Current overview of the OpenATV images building servers"), where=PluginDescriptor.WHERE_PLUGINMENU, fnc=main)
+	return [PluginDescriptor(name="OpenATV Status", icon="plugin.png", description=_("Current overview of the OpenATV images building servers"), where=PluginDescriptor.WHERE_PLUGINMENU, fnc=main),
+			PluginDescriptor(name="OpenATV Status overview", icon="plugin.png", description=_("Build status of all OpenATV platforms at a glance"), where=PluginDescriptor.WHERE_PLUGINMENU, fnc=overview),
+			PluginDescriptor(where=PluginDescriptor.WHERE_AUTOSTART, fnc=autostart),
+			PluginDescriptor(where=PluginDescriptor.WHERE_SESSIONSTART, fnc=sessionstart)]
@@ -0,0 +1,429 @@
+#########################################################################################################
+#                                                                                                       #
+#  e2stub: minimal stand-in for the Enigma2 runtime, so the plugin can be imported and driven on a PC  #
+#  Usage: 'from e2stub import install, importPlugin, mainloop' (see 'importtime.py' and 'harness.py')  #
+#                                                                                                       #
+#########################################################################################################
+
+# PYTHON IMPORTS
+from importlib.util import spec_from_file_location, module_from_spec
+from os.path import abspath, dirname, join
+from queue import Queue, Empty
+from sys import modules
+from threading import Thread, Lock
+from time import monotonic, sleep
+from types import ModuleType
+
+SRCPATH = abspath(join(dirname(__file__), "..", "src"))
+PEERS = []  # streamurls returned by 'getPeerStreamingBoxes'
+ASCIICODE = [0]  # code returned by 'getPrevAsciiCode', set it before calling a screen's 'gotAsciiCode' action
+BOXINFO = {"BoxName": "stubbox", "displaymodel": "Stubbox", "displaybrand": "Stub", "displaydistro": "openatv", "imageversion": "7.6", "imgrevision": "0", "socfamily": "stub"}
+
+
+class MainLoop:  # replaces the twisted reactor and the enigma main loop: timers and 'callFromThread' run in the calling thread
+	def __init__(self):
+		self.timers = []
+		self.calls = Queue()
+		self.lock = Lock()
+		self.pending = 0  # number of running worker threads
+
+	def callInThread(self, func, *args, **kwargs):
+		with self.lock:
+			self.pending += 1
+		Thread(target=self.worker, args=(func, args, kwargs), daemon=True).start()
+
+	def worker(self, func, args, kwargs):
+		try:
+			func(*args, **kwargs)
+		finally:
+			with self.lock:
+				self.pending -= 1
+
+	def idle(self):  # no worker is running and no call is waiting for the main loop
+		return not self.pending and self.calls.empty()
+
+	def callFromThread(self, func, *args, **kwargs):
+		self.calls.put((func, args, kwargs))
+
+	def iterate(self, timeout=0.005):  # runs all due calls and timers once
+		try:
+			func, args, kwargs = self.calls.get(timeout=timeout)
+			func(*args, **kwargs)
+			while True:
+				func, args, kwargs = self.calls.get_nowait()
+				func(*args, **kwargs)
+		except Empty:
+			pass
+		now = monotonic()
+		for timer in self.timers[:]:
+			if timer.due is not None and timer.due <= now:
+				timer.fire(now)
+
+	def run(self, until=None, timeout=10.0):  # iterates until 'until()' is true or timeout (seconds) has expired, returns elapsed seconds
+		start = monotonic()
+		while monotonic() - start < timeout:
+			self.iterate()
+			if until and until():
+				break
+		return monotonic() - start
+
+
+mainloop = MainLoop()
+
+
+class eTimer:
+	def __init__(self):
+		self.callback = []
+		self.due = None
+		self.interval = 0
+		self.singleshot = False
+		mainloop.timers.append(self)
+
+	def start(self, msec, singleshot=False):
+		self.interval = msec / 1000
+		self.singleshot = singleshot
+		self.due = monotonic() + self.interval
+
+	def startLongTimer(self, sec):
+		self.start(sec * 1000, True)
+
+	def stop(self):
+		self.due = None
+
+	def isActive(self):
+		return self.due is not None
+
+	def fire(self, now):
+		self.due = None if self.singleshot else now + self.interval
+		for callback in self.callback[:]:
+			callback()
+
+
+class Size:
+	def __init__(self, width, height):
+		self._width, self._height = width, height
+
+	def width(self):
+		return self._width
+
+	def height(self):
+		return self._height
+
+
+class GPixmap:  # decoded picture: only its size is known (taken from the PNG header)
+	def __init__(self, path):
+		self.path = path
+		width, height = 0, 0
+		try:
+			with open(path, "rb") as file:
+				header = file.read(24)
+			if header[:8] == b"\x89PNG\r\n\x1a\n":
+				width, height = int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big")
+		except OSError:
+			pass
+		self._size = Size(width, height)
+
+	def size(self):
+		return self._size
+
+
+class Desktop:
+	def size(self):
+		return Size(1920, 1080)
+
+
+class ConfigElement:
+	def __init__(self, default):
+		self.default = default
+		self.value = default
+		self.saved_value = None
+		self.notifiers = []
+
+	def save(self):
+		self.saved_value = self.value
+
+	def load(self):
+		if self.saved_value is not None:
+			self.value = self.saved_value
+
+	def cancel(self):
+		self.load()
+
+	def addNotifier(self, notifier, initial_call=True, immediate_feedback=True):
+		self.notifiers.append(notifier)
+		if initial_call:
+			notifier(self)
+
+	def removeNotifier(self, notifier):
+		if notifier in self.notifiers:
+			self.notifiers.remove(notifier)
+
+	def changed(self):
+		for notifier in self.notifiers[:]:
+			notifier(self)
+
+
+class ConfigSelection(ConfigElement):
+	def __init__(self, default=None, choices=None):
+		ConfigElement.__init__(self, default)
+		self.setChoices(choices or [], default)
+
+	def setChoices(self, choices, default=None):
+		self.choices = [x[0] if isinstance(x, tuple) else x for x in choices]
+		if self.value not in self.choices:
+			self.value = default
+
+
+class ConfigText(ConfigElement):
+	def __init__(self, default="", fixed_size=True, visible_width=False):
+		ConfigElement.__init__(self, default)
+
+
+class ConfigInteger(ConfigElement):
+	def __init__(self, default=0, limits=None):
+		ConfigElement.__init__(self, default)
+
+
+class ConfigSubsection:
+	def save(self):
+		for item in self.__dict__.values():
+			if hasattr(item, "save"):
+				item.save()
+
+
+class Label:
+	def __init__(self, text=""):
+		self.text = text
+		self.visible = True
+
+	def setText(self, text):
+		self.text = text
+
+	def getText(self):
+		return self.text
+
+	def show(self):
+		self.visible = True
+
+	def hide(self):
+		self.visible = False
+
+
+class PixmapInstance:
+	def setPixmapScaleFlags(self, flags):
+		pass
+
+	def setPixmapFromFile(self, path):
+		self.path = path
+
+	def setPixmap(self, pixmap):
+		self.pixmap = pixmap
+
+
+class Pixmap(Label):
+	def __init__(self):
+		Label.__init__(self)
+		self.instance = PixmapInstance()
+
+
+class List:
+	def __init__(self, list=None):
+		self.list = list or []
+		self.style = "default"
+		self.index = 0
+		self.updates = 0  # number of list redraws
+
+	def setList(self, list):
+		self.list = list
+		self.updates += 1
+
+	updateList = setList
+
+	def getSelectedIndex(self):
+		return self.index if self.list else None
+
+	def setIndex(self, index):
+		self.index = index
+
+	def up(self):
+		self.index = max(self.index - 1, 0)
+
+	def down(self):
+		self.index = min(self.index + 1, max(len(self.list) - 1, 0))
+
+	pageUp, pageDown, top, bottom = up, down, up, down
+
+
+class Input(Label):  # text input without cursor handling, 'number' appends the digit (no SMS-style multi-tap)
+	TEXT, PIN, NUMBER = range(3)
+
+	def __init__(self, text="", maxSize=False, visible_width=False, type=TEXT):
+		Label.__init__(self, text)
+
+	def handleAscii(self, code):
+		self.text += chr(code)
+
+	def number(self, number):
+		self.text += str(number)
+
+	def deleteBackward(self):
+		self.text = self.text[:-1]
+
+	def delete(self):
+		pass
+
+	left = right = home = end = delete
+
+
+class eRCInput:
+	kmNone, kmAscii = range(2)
+	instance = None
+
+	def __init__(self):
+		self.mode = self.kmNone
+
+	@classmethod
+	def getInstance(cls):
+		if cls.instance is None:
+			cls.instance = cls()
+		return cls.instance
+
+	def setKeyboardMode(self, mode):
+		self.mode = mode
+
+
+class Screen:
+	def __init__(self, session, skin=None, parent=None):
+		self.session = session
+		self.widgets = {}
+		self.onLayoutFinish = []
+		self.onClose = []
+		self.onShown = []
+		self.onHide = []
+		self.onExecBegin = []
+		self.onExecEnd = []
+
+	def __setitem__(self, key, value):
+		self.widgets[key] = value
+
+	def __getitem__(self, key):
+		return self.widgets[key]
+
+	def setTitle(self, title):
+		self.title = title
+
+	def close(self, *retval):
+		for callback in self.onClose[:]:
+			callback()
+		self.session.closed(self, *retval)
+
+
+class ConfigListScreen:
+	def __init__(self, list, session=None, on_change=None):
+		self["config"] = List(list)
+
+
+class MessageBox(Screen):
+	TYPE_YESNO, TYPE_INFO, TYPE_WARNING, TYPE_ERROR = range(4)
+
+	def __init__(self, session, text="", type=TYPE_YESNO, timeout=-1, close_on_any_key=False, default=True, **kwargs):
+		Screen.__init__(self, session)
+		self.text = text
+
+
+class Session:  # opens screens and runs 'onLayoutFinish' like enigma does
+	def __init__(self):
+		self.screens = []
+		self.callbacks = {}
+
+	def open(self, screenclass, *args, **kwargs):
+		screen = screenclass(self, *args, **kwargs)
+		self.screens.append(screen)
+		for callback in screen.onLayoutFinish[:] + screen.onExecBegin[:]:
+			callback()
+		return screen
+
+	def openWithCallback(self, callback, screenclass, *args, **kwargs):
+		screen = self.open(screenclass, *args, **kwargs)
+		self.callbacks[screen] = callback
+		return screen
+
+	def closed(self, screen, *retval):
+		for callback in screen.onExecEnd[:]:
+			callback()
+		if screen in self.screens:
+			self.screens.remove(screen)
+		callback = self.callbacks.pop(screen, None)
+		if callback:
+			callback(*retval)
+
+
+class PluginDescriptor:
+	WHERE_PLUGINMENU, WHERE_EXTENSIONSMENU, WHERE_AUTOSTART, WHERE_SESSIONSTART = range(4)
+
+	def __init__(self, name="", description="", where=None, icon=None, fnc=None, **kwargs):
+		self.name, self.description, self.where, self.icon, self.fnc = name, description, where, icon, fnc
+
+
+class Language:
+	def addCallback(self, callback):
+		pass
+
+
+def newmodule(name, **attributes):
+	module = ModuleType(name)
+	module.__dict__.update(attributes)
+	modules[name] = module
+	return module
+
+
+def install(reactor=True):  # installs the stub modules, 'reactor=False' keeps an installed twisted reactor
+	config = ConfigSubsection()
+	config.plugins = ConfigSubsection()
+	config.misc = ConfigSubsection()
+	config.misc.standbyCounter = ConfigInteger(default=0)
+	config.skin = ConfigSubsection()
+	config.skin.primary_skin = ConfigText(default="")
+	newmodule("enigma", eTimer=eTimer, getDesktop=lambda screen: Desktop(), getPeerStreamingBoxes=lambda: PEERS[:], getPrevAsciiCode=lambda: ASCIICODE[0], eRCInput=eRCInput,
+				BT_SCALE=1, BT_KEEP_ASPECT_RATIO=2, BT_HALIGN_CENTER=4, BT_VALIGN_CENTER=8, ePicLoad=None)
+	for package in ("Components", "Components.Sources", "Plugins", "Screens", "Tools"):
+		newmodule(package, __path__=[])
+	newmodule("Components.ActionMap", ActionMap=lambda contexts, actions, prio=0: actions, NumberActionMap=lambda contexts, actions, prio=0: actions, HelpableActionMap=lambda *args, **kwargs: None)
+	newmodule("Components.config", config=config, ConfigSubsection=ConfigSubsection, ConfigSelection=ConfigSelection, ConfigText=ConfigText,
+				ConfigInteger=ConfigInteger, getConfigListEntry=lambda *args: args)
+	newmodule("Components.ConfigList", ConfigListScreen=ConfigListScreen)
+	newmodule("Components.Input", Input=Input)
+	newmodule("Components.Label", Label=Label)
+	newmodule("Components.Pixmap", Pixmap=Pixmap)
+	newmodule("Components.Sources.List", List=List)
+	newmodule("Components.SystemInfo", BoxInfo=type("BoxInfo", (), {"getItem": staticmethod(lambda key, default=None: BOXINFO.get(key, default))}))
+	newmodule("Components.Language", language=Language())
+	newmodule("Plugins.Plugin", PluginDescriptor=PluginDescriptor)
+	newmodule("Screens.Screen", Screen=Screen)
+	newmodule("Screens.MessageBox", MessageBox=MessageBox)
+	newmodule("Screens.Standby", inStandby=None)
+	newmodule("Tools.LoadPixmap", LoadPixmap=lambda path=None, cached=False, **kwargs: GPixmap(path))
+	newmodule("Tools.Directories", resolveFilename=resolveFilename, SCOPE_PLUGINS="SCOPE_PLUGINS")
+	if reactor:
+		for package in ("twisted", "twisted.internet"):
+			newmodule(package, __path__=[])
+		modules["twisted"].internet = modules["twisted.internet"]
+		modules["twisted.internet"].reactor = newmodule("twisted.internet.reactor", callInThread=mainloop.callInThread, callFromThread=mainloop.callFromThread,
+												callLater=lambda delay, func, *args: Thread(target=lambda: (sleep(delay), mainloop.callFromThread(func, *args)), daemon=True).start())
+	return config
+
+
+def resolveFilename(scope, path=""):
+	if path.startswith("Extensions/OpenATVstatus"):
+		return join(SRCPATH, path[len("Extensions/OpenATVstatus/"):])
+	return join("/usr/lib/enigma2/python/Plugins", path)
+
+
+def importPlugin(name="plugin"):  # imports a plugin module as 'OpenATVstatus.<name>' like enigma does
+	if "OpenATVstatus" not in modules:
+		spec = spec_from_file_location("OpenATVstatus", join(SRCPATH, "__init__.py"), submodule_search_locations=[SRCPATH])
+		package = module_from_spec(spec)
+		modules["OpenATVstatus"] = package
+		spec.loader.exec_module(package)
+	__import__(f"OpenATVstatus.{name}")  # unlike 'importlib.import_module' this is covered by '-X importtime'
+	return modules[f"OpenATVstatus.{name}"]
@@ -0,0 +1,194 @@
+#########################################################################################################
+#                                                                                                       #
+#  harness: end-to-end latency check of 'Buildstatus.py' and the plugin's screens against 'standin.py'  #
+#  Usage: "python harness.py [options]" - try 'python harness.py -h' for more information               #
+#                                                                                                       #
+#########################################################################################################
+
+# PYTHON IMPORTS
+from getopt import getopt, GetoptError
+from json import dump
+from os import environ
+from os.path import abspath, dirname
+from shutil import rmtree
+from sys import argv, exit, modules, path
+from tempfile import mkdtemp
+from time import perf_counter
+
+TOOLSPATH = abspath(dirname(__file__))
+SCENARIOS = {"baseline": {},  # server conditions (see 'standin.CONDITIONS')
+			"slow": {"latency": 300, "jitter": 100},
+			"throttled": {"bandwidth": 40000},
+			"flaky": {"errors": 0.2},
+			"timeouts": {"timeouts": 0.05, "hang": 8}}
+FLOWTIMEOUT = 30  # seconds until a flow is counted as failed
+
+
+def percentile(values, pct):  # nearest-rank percentile of a sorted list
+	return values[min(len(values) - 1, max(0, round(pct / 100 * len(values) + 0.5) - 1))] if values else None
+
+
+class Harness:
+	def __init__(self, server, plugin, mainloop, session):
+		self.server = server
+		self.plugin = plugin
+		self.mainloop = mainloop
+		self.session = session
+		self.BS = plugin.BS
+		self.samples = {}  # {(scenario, measure): [seconds]}
+		self.failures = {}  # {(scenario, measure): count}
+
+	def record(self, scenario, measure, seconds, failed=False):
+		key = (scenario, measure)
+		self.samples.setdefault(key, [])
+		self.failures.setdefault(key, 0)
+		if failed:
+			self.failures[key] += 1
+		else:
+			self.samples[key].append(seconds)
+
+	def coldstart(self):  # forget everything the plugin has fetched before
+		with self.BS.cachelock:
+			self.BS.platcache.clear()
+			self.BS.validators.clear()
+		self.plugin.ATVglobs.STATUSCACHE.clear()
+		rmtree(self.plugin.ATVglobs.TEMPPATH, ignore_errors=True)  # box pictures and their manifest
+		self.plugin.PC.manifest = None
+		self.plugin.PC.clear()
+
+	def idle(self):  # neither the plugin's executor, its dispatcher nor the main loop has work left
+		EX, DP = self.plugin.EX, self.plugin.DP
+		with EX.lock:
+			busy = EX.running or EX.queue
+		with DP.lock:
+			busy = busy or DP.pending
+		return not busy and self.mainloop.idle()
+
+	def settle(self):  # waits for stray workers of the former flow (e.g. injected timeouts)
+		self.mainloop.run(until=self.idle, timeout=FLOWTIMEOUT)
+
+	def runcli(self, scenario):  # 'python Buildstatus.py -p <platform>': platform page of the last known platform list (or content.json + platform page)
+		BuildstatusClass = modules["OpenATVstatus.Buildstatus"].Buildstatus
+		for platform in self.BS.platlist[:2]:
+			BS = BuildstatusClass()
+			start = perf_counter()
+			BS.quickstart(platform)
+			result = BS.fetch(platform) if BS.platlist else None
+			self.record(scenario, "cli", perf_counter() - start, failed=not result or bool(result.error))
+
+	def runfavorites(self, scenario):  # favorites screen: list shown, then all server status and box pictures loaded
+		self.coldstart()
+		start = perf_counter()
+		screen = self.session.open(self.plugin.ATVfavorites)
+		self.mainloop.run(until=lambda: screen.boxlist, timeout=FLOWTIMEOUT)
+		listed = perf_counter() - start
+		unclear = not screen.boxlist or any(item[2] == "unclear" for item in getattr(screen, "baselist", []))
+		self.record(scenario, "favorites-list", listed, failed=unclear)
+		self.mainloop.run(until=self.idle, timeout=FLOWTIMEOUT)
+		self.record(scenario, "favorites-complete", perf_counter() - start, failed=not self.idle())
+		screen.exit()
+
+	def runimageslist(self, scenario):  # images list: first platform shown, single platform switch, fast scroll over three platforms
+		self.coldstart()
+		platform = self.BS.platlist[0]
+		start = perf_counter()
+		screen = self.session.open(self.plugin.ATVimageslist, ("", platform))
+
+		def shown():
+			return screen.result is not None and not screen.loading and screen.result.platform == self.BS.platlist[screen.platidx]
+		self.mainloop.run(until=shown, timeout=FLOWTIMEOUT)
+		self.record(scenario, "imageslist-open", perf_counter() - start, failed=not shown() or bool(screen.result.error))
+		for measure, steps in (("imageslist-switch", 1), ("imageslist-scroll", 3)):
+			start = perf_counter()
+			for step in range(steps):
+				screen.nextPlatform()
+				self.mainloop.run(timeout=0.05)  # key repeat
+			self.mainloop.run(until=shown, timeout=FLOWTIMEOUT)
+			self.record(scenario, measure, perf_counter() - start, failed=not shown() or bool(screen.result.error))
+		screen.exit()
+
+	def run(self, scenarios, iterations):
+		for scenario in scenarios:
+			self.server.setconditions(**dict(self.server.defaults, **SCENARIOS[scenario]))
+			for iteration in range(iterations):
+				self.runcli(scenario)
+				self.runfavorites(scenario)
+				self.runimageslist(scenario)
+				self.settle()
+			print(f"scenario '{scenario}' done: {self.server.stats['requests']} requests, {self.server.stats['errors']} errors and {self.server.stats['timeouts']} timeouts injected")
+			print(f"executor: {self.plugin.EX.getstats()}")
+
+	def report(self):  # returns rows of (scenario, measure, samples, failed, p50, p90, p99, max) in msec
+		rows = []
+		for (scenario, measure), values in self.samples.items():
+			values = sorted(values)
+			rows.append((scenario, measure, len(values), self.failures[(scenario, measure)]) + tuple(round(percentile(values, pct) * 1000) if values else None for pct in (50, 90, 99, 100)))
+		return rows
+
+
+def main(argv):
+	scenarios, iterations, jsonfile, fixtures = list(SCENARIOS), 5, None, None
+	try:
+		opts = getopt(argv, "s:n:j:f:h", ["scenarios=", "iterations=", "json=", "fixtures=", "help"])[0]
+	except GetoptError as error:
+		print(f"Error: {error}")
+		exit(2)
+	for opt, arg in opts:
+		if opt in ("-h", "--help"):
+			print("Usage  : python harness.py [options...]\n"
+				"Example: python harness.py -s baseline,slow -n 10\n"
+				f"-s, --scenarios <name,...>\tRun these scenarios only: {','.join(SCENARIOS)}\n"
+				"-n, --iterations <number>\tRepeat every flow this often per scenario (default: 5)\n"
+				"-f, --fixtures <path>\t\tServe recorded data from path (see 'standin.py --record')\n"
+				"-j, --json <filename>\t\tAlso write the results formatted in JSON")
+			return
+		if opt in ("-s", "--scenarios"):
+			scenarios = [x.strip() for x in arg.split(",")]
+			unknown = [x for x in scenarios if x not in SCENARIOS]
+			if unknown:
+				print(f"Unknown scenario '{', '.join(unknown)}'. Supported is: {', '.join(SCENARIOS)}")
+				exit(2)
+		elif opt in ("-n", "--iterations"):
+			iterations = int(arg)
+		elif opt in ("-j", "--json"):
+			jsonfile = arg
+		elif opt in ("-f", "--fixtures"):
+			fixtures = abspath(arg)
+	from standin import StandinServer, Fixtures, CONDITIONS
+	server = StandinServer(fixtures=Fixtures(fixtures) if fixtures else None, seed=4711).start()
+	server.defaults = dict(CONDITIONS)
+	environ.update(server.endpoints())  # must be set before 'Buildstatus.py' and the plugin are imported
+	environ["XDG_CACHE_HOME"] = mkdtemp(prefix="OpenATVstatus-cache-")  # last known platform list of 'quickstart'
+	from e2stub import install, importPlugin, mainloop, Session
+	install()
+	plugin = importPlugin()
+	plugin.ATVglobs.TEMPPATH = f"{mkdtemp(prefix='OpenATVstatus-')}/"
+	plugin.bootstrap()
+	if not plugin.BS.platlist:
+		print(f"Error: {plugin.BS.error}")
+		exit(1)
+	favorites = []
+	for platform in plugin.BS.platlist:  # two favorites per platform
+		result = plugin.BS.fetch(platform)
+		favorites += [(boxname, platform) for boxname in list(result.htmldict["boxinfo"])[:2]] if result.htmldict else []
+	plugin.FAV.replace(favorites)
+	harness = Harness(server, plugin, mainloop, Session())
+	harness.run(scenarios, iterations)
+	rows = harness.report()
+	separator = "+------------+--------------------+---------+--------+--------+--------+--------+--------+"
+	rowfmt = "| {:<10} | {:<18} | {:>7} | {:>6} | {:>6} | {:>6} | {:>6} | {:>6} |"
+	print(separator)
+	print(rowfmt.format("Scenario", "Measure", "Samples", "Failed", "p50 ms", "p90 ms", "p99 ms", "max ms"))
+	print(separator)
+	for row in rows:
+		print(rowfmt.format(*("-" if x is None else x for x in row)))
+	print(separator)
+	if jsonfile:
+		with open(jsonfile, "w") as file:
+			dump([dict(zip(("scenario", "measure", "samples", "failed", "p50", "p90", "p99", "max"), row)) for row in rows], file, indent=1)
+	server.shutdown()
+
+
+if __name__ == "__main__":
+	path.insert(0, TOOLSPATH)
+	main(argv[1:])
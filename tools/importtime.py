@@ -0,0 +1,75 @@
+#########################################################################################################
+#                                                                                                       #
+#  importtime: import-time regression check for both entry points ('Buildstatus.py' CLI and plugin)    #
+#  Usage: "python importtime.py [--limit <ms>]" - fails if an entry point loads heavy modules on import #
+#                                                                                                       #
+#########################################################################################################
+
+# PYTHON IMPORTS
+from getopt import getopt, GetoptError
+from json import dumps, loads
+from os.path import abspath, dirname, join
+from subprocess import run
+from sys import argv, executable, exit, modules, path
+
+TOOLSPATH = abspath(dirname(__file__))
+SRCPATH = abspath(join(TOOLSPATH, "..", "src"))
+HEAVY = ["twisted", "requests", "urllib3", "zoneinfo", "xml.etree", "shutil"]  # must not be loaded while importing the entry points
+CHILDCODE = {"cli": f"import sys; sys.path.insert(0, {SRCPATH!r}); import Buildstatus",
+			"plugin": f"import sys; sys.path.insert(0, {TOOLSPATH!r}); import e2stub; e2stub.install(); e2stub.importPlugin()"}
+MODULENAME = {"cli": "Buildstatus", "plugin": "OpenATVstatus.plugin"}
+
+
+def child(entrypoint):  # runs inside the measured interpreter: reports which heavy modules have been loaded by the entry point
+	preloaded = set(modules)  # e.g. 'shutil' may already be loaded by the interpreter itself
+	exec(CHILDCODE[entrypoint])
+	loaded = [name for name in HEAVY if name in modules and name not in preloaded and getattr(modules[name], "__file__", None)]  # stub modules have no file
+	print(dumps(loaded))
+
+
+def measure(entrypoint):  # returns (cumulative import time in ms, loaded heavy modules)
+	process = run([executable, "-X", "importtime", abspath(__file__), "--child", entrypoint], capture_output=True, text=True)
+	if process.returncode:
+		raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "unknown error")
+	cumulative = 0
+	for line in process.stderr.splitlines():  # format: 'import time: self [us] | cumulative | imported package'
+		parts = line.split("|")
+		if len(parts) == 3 and parts[2].strip() == MODULENAME[entrypoint]:
+			cumulative = int(parts[1].strip())
+	return cumulative / 1000, loads(process.stdout.strip().splitlines()[-1])
+
+
+def main(argv):
+	limit = None
+	try:
+		opts = getopt(argv, "l:h", ["limit=", "child=", "help"])[0]
+	except GetoptError as error:
+		print(f"Error: {error}")
+		exit(2)
+	for opt, arg in opts:
+		if opt == "--child":
+			child(arg)
+			return
+		if opt in ("-h", "--help"):
+			print("Usage: python importtime.py [--limit <ms>]\n"
+				"-l, --limit <ms>\tFail if an entry point needs more than <ms> milliseconds to import")
+			return
+		if opt in ("-l", "--limit"):
+			limit = float(arg)
+	failed = False
+	for entrypoint in ("cli", "plugin"):
+		try:
+			cumulative, loaded = measure(entrypoint)
+		except RuntimeError as error:
+			print(f"{entrypoint:<7}: ERROR '{error}'")
+			failed = True
+			continue
+		regression = bool(loaded) or (limit is not None and cumulative > limit)
+		failed = failed or regression
+		print(f"{entrypoint:<7}: {cumulative:8.1f} ms, heavy modules loaded: {', '.join(loaded) if loaded else 'none'}{'  <-- REGRESSION' if regression else ''}")
+	exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+	path.insert(0, TOOLSPATH)
+	main(argv[1:])
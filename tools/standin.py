@@ -0,0 +1,286 @@
+#########################################################################################################
+#                                                                                                       #
+#  standin: local stand-in for the openATV servers (content.json, platform pages, status & pictures)    #
+#  Usage: "python standin.py [options]" - try 'python standin.py -h' for more information               #
+#                                                                                                       #
+#########################################################################################################
+
+# PYTHON IMPORTS
+from getopt import getopt, GetoptError
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from os import makedirs
+from os.path import abspath, dirname, exists, join
+from random import Random
+from re import sub
+from struct import pack
+from sys import argv, exit
+from threading import Lock, Thread
+from time import sleep
+from urllib.parse import parse_qsl, urlsplit
+from zlib import compress, crc32
+
+FIXTURES = abspath(join(dirname(__file__), "fixtures"))  # recorded data: content.json, platforms/<slug>.html, status/<boxname>.html, boxes/<boxname>.png
+CONTENTURL = "http://api.mynonpublic.com/content.json"
+PICURL = "https://raw.githubusercontent.com/oe-alliance/remotes/master/boxes/"
+STATUSURL = "https://ampel.mynonpublic.com/status/index.php?boxname="
+CONDITIONS = {"latency": 0, "jitter": 0, "bandwidth": 0, "errors": 0.0, "timeouts": 0.0, "hang": 10.0}  # msec, msec, bytes/sec (0 = unlimited), rate, rate, sec
+SYNTHETIC = {"ARM 7.5": 40, "ARM 7.6": 60, "MIPS 7.5": 30, "MIPS 7.6": 35, "AARCH64 7.6": 80}  # {platform: number of boxes} if nothing has been recorded
+
+
+def slugify(platform):  # 'ARM 7.6' -> 'arm_7.6'
+	return platform.replace(" ", "_").lower()
+
+
+def png(width=4, height=3, color=(0x20, 0x60, 0xA0)):  # tiny valid png as stand-in for box pictures which have not been recorded
+	def chunk(tag, data):
+		return pack(">I", len(data)) + tag + data + pack(">I", crc32(tag + data) & 0xFFFFFFFF)
+	rows = b"".join(b"\x00" + bytes(color) * width for row in range(height))
+	return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)) + chunk(b"IDAT", compress(rows)) + chunk(b"IEND", b"")
+
+
+def synthesize():  # returns ({platform: original url}, {platform: htmldata}) of a made-up but realistic build server
+	rnd = Random(4711)
+	urls = {platform: f"https://feeds2.mynonpublic.com/{slugify(platform)}/index.html" for platform in SYNTHETIC}
+	buttons = "".join(f"<button onclick=\"location.href='{url}'\">{platform}</button>" for platform, url in urls.items())
+	pages = {}
+	for platform, count in SYNTHETIC.items():
+		arch = platform.split(" ")[0].lower()
+		building = rnd.randrange(count)
+		rows = []
+		for idx in range(count):
+			status = "Building" if idx == building else rnd.choice(["Complete"] * 8 + ["Failed", "Waiting"])
+			buildtime = f"{rnd.randint(0, 1):02d}:{rnd.randint(5, 59):02d}:{rnd.randint(0, 59):02d}"
+			rows.append(f'<tr>\n<td class="no">{idx + 1}</td><td class="boxname">{arch}box{idx}</td><td class="oem">OEM{idx % 9}</td><td class="{status.lower()}">{status}</td>'
+						f'<td>2025/06/01, 10:{idx % 60:02d}:00</td><td>2025/06/01, 11:00:00</td><td>2025/06/01, 11:30:00</td><td>00:0{idx % 9}:12</td><td>{buildtime}</td>\n</tr>')
+		pages[platform] = (f"<html><head><title>openATV {platform} Build Status</title></head><body>{buttons}<table><thead>\n<tr><th>No</th><th>BoxName</th><th>OemName</th>"
+							"<th>BuildStatus</th><th>StartBuild</th><th>StartFeedSync</th><th>EndBuild</th><th>SyncTime</th><th>BuildTime</th></tr>\n</thead><tbody>\n"
+							+ "\n".join(rows) + "\n</tbody></table></body></html>")
+	return urls, pages
+
+
+class Fixtures:  # recorded (or synthesized) server data, platform urls are rewritten to point to the stand-in server
+	def __init__(self, path=FIXTURES):
+		self.path = path
+		contentfile = join(path, "content.json")
+		if exists(contentfile):
+			with open(contentfile) as file:
+				content = loads(file.read())
+			urls = {platform: item["url"] for platform, item in content["versionurls"].items()}
+			pages = {}
+			for platform in urls:
+				with open(join(path, "platforms", f"{slugify(platform)}.html"), encoding="utf-8") as file:
+					pages[platform] = file.read()
+		else:
+			content = {}
+			urls, pages = synthesize()
+		self.content = content
+		self.urls = urls
+		self.pages = pages
+		self.baseurl = None
+
+	def rebase(self, baseurl):  # rewrites all platform urls (content.json & buttons of platform pages) to the stand-in server
+		self.baseurl = baseurl
+		localurls = {platform: f"{baseurl}/platforms/{slugify(platform)}.html" for platform in self.urls}
+		content = dict(self.content)
+		content["versionurls"] = {platform: dict(self.content.get("versionurls", {}).get(platform, {}), url=localurls[platform]) for platform in self.urls}
+		self.files = {"/content.json": dumps(content).encode()}
+		for platform, htmldata in self.pages.items():
+			for original, local in ((self.urls[name], localurls[name]) for name in self.urls):
+				htmldata = htmldata.replace(f"'{original}'", f"'{local}'")
+			self.files[f"/platforms/{slugify(platform)}.html"] = htmldata.encode()
+
+	def get(self, path, query):  # returns (content type, body) or None
+		if path in self.files:
+			return ("application/json" if path.endswith(".json") else "text/html; charset=utf-8"), self.files[path]
+		if path == "/status/index.php":
+			boxname = sub(r"[^\w.-]", "", query.get("boxname", ""))
+			if not boxname:
+				return None
+			filename = join(self.path, "status", f"{boxname}.html")
+			if exists(filename):
+				with open(filename, "rb") as file:
+					return "text/html; charset=utf-8", file.read()
+			icon = ("gruen.png", "gelb.png", "rot.png")[crc32(boxname.encode()) % 3]
+			return "text/html; charset=utf-8", f"<html><body><center><img src='{icon}'/></center></body></html>".encode()
+		if path.startswith("/boxes/") and path.endswith(".png"):
+			boxname = sub(r"[^\w.-]", "", path[7:-4])
+			filename = join(self.path, "boxes", f"{boxname}.png")
+			if exists(filename):
+				with open(filename, "rb") as file:
+					return "image/png", file.read()
+			return "image/png", png(color=(crc32(boxname.encode()) & 0xFF, 0x60, 0xA0))
+		return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def log_message(self, format, *args):  # keep the console quiet
+		pass
+
+	def do_GET(self):
+		server = self.server
+		url = urlsplit(self.path)
+		query = dict(parse_qsl(url.query))
+		if url.path == "/_control":  # changes the server conditions at runtime, e.g. '/_control?latency=200&errors=0.1', shows them and the stats
+			if query:
+				server.setconditions(**{key: float(value) for key, value in query.items() if key in CONDITIONS})
+			return self.reply(200, "application/json", dumps({"conditions": server.conditions, "stats": server.stats}).encode())
+		conditions, rnd = server.draw()
+		server.count("requests")
+		delay = conditions["latency"] + rnd.uniform(-conditions["jitter"], conditions["jitter"])
+		if delay > 0:
+			sleep(delay / 1000)
+		if rnd.random() < conditions["timeouts"]:  # accept, but never answer
+			server.count("timeouts")
+			sleep(conditions["hang"])
+			self.close_connection = True
+			return
+		if rnd.random() < conditions["errors"]:
+			server.count("errors")
+			return self.reply(503, "text/plain", b"Service Unavailable (injected)")
+		found = server.fixtures.get(url.path, query)
+		if not found:
+			return self.reply(404, "text/plain", b"Not Found")
+		ctype, body = found
+		etag = f'"{sha1(body).hexdigest()}"'
+		if self.headers.get("If-None-Match") == etag:
+			server.count("notmodified")
+			return self.reply(304, None, b"", etag=etag)
+		self.reply(200, ctype, body, etag=etag, bandwidth=conditions["bandwidth"])
+
+	def reply(self, code, ctype, body, etag=None, bandwidth=0):
+		self.send_response(code)
+		if ctype:
+			self.send_header("Content-Type", ctype)
+		if etag:
+			self.send_header("ETag", etag)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		chunksize = max(int(bandwidth) // 20, 512) if bandwidth else len(body) or 1  # throttled bodies are sent in 50 msec slices
+		for idx in range(0, len(body), chunksize):
+			self.wfile.write(body[idx:idx + chunksize])
+			if bandwidth:
+				self.wfile.flush()
+				sleep(chunksize / bandwidth)
+		self.server.count("bytessent", len(body))
+
+
+class StandinServer(ThreadingHTTPServer):
+	daemon_threads = True
+	request_queue_size = 128  # the plugin downloads all pictures and server status at once, a short backlog would add SYN retries
+
+	def __init__(self, port=0, fixtures=None, seed=None, **conditions):
+		ThreadingHTTPServer.__init__(self, ("127.0.0.1", port), StandinHandler)
+		self.baseurl = f"http://127.0.0.1:{self.server_address[1]}"
+		self.fixtures = fixtures or Fixtures()
+		self.fixtures.rebase(self.baseurl)
+		self.lock = Lock()
+		self.random = Random(seed)
+		self.conditions = dict(CONDITIONS)
+		self.stats = {}
+		self.setconditions(**conditions)
+
+	def setconditions(self, **conditions):  # unknown keys raise a KeyError, omitted keys keep their value
+		with self.lock:
+			for key, value in conditions.items():
+				if key not in CONDITIONS:
+					raise KeyError(f"unknown condition '{key}'")
+				self.conditions[key] = value
+			self.stats = {"requests": 0, "timeouts": 0, "errors": 0, "notmodified": 0, "bytessent": 0}
+
+	def draw(self):  # returns (current conditions, random generator) for a single request
+		with self.lock:
+			return dict(self.conditions), Random(self.random.random())
+
+	def count(self, key, value=1):
+		with self.lock:
+			self.stats[key] += value
+
+	def endpoints(self):  # environment variables which redirect 'Buildstatus.py' and the plugin to this server
+		return {"OPENATVSTATUS_CONTENTURL": f"{self.baseurl}/content.json", "OPENATVSTATUS_PICURL": f"{self.baseurl}/boxes/",
+				"OPENATVSTATUS_STATUSURL": f"{self.baseurl}/status/index.php?boxname="}
+
+	def start(self):  # serves in a background thread
+		Thread(target=self.serve_forever, daemon=True).start()
+		return self
+
+
+def record(path, boxnames=()):  # records the live servers into 'path', status pages and pictures only for the given boxnames
+	from requests import get
+	response = get(CONTENTURL, timeout=(3.05, 6))
+	response.raise_for_status()
+	content = loads(response.text)
+	for folder in ("platforms", "status", "boxes"):
+		makedirs(join(path, folder), exist_ok=True)
+	with open(join(path, "content.json"), "w") as file:
+		file.write(dumps(content, indent=1))
+	for platform, item in content["versionurls"].items():
+		response = get(item["url"], timeout=(3.05, 6))
+		response.raise_for_status()
+		with open(join(path, "platforms", f"{slugify(platform)}.html"), "wb") as file:
+			file.write(response.content)
+		print(f"recorded platform '{platform}' ({len(response.content)} bytes)")
+	for boxname in boxnames:
+		for url, filename in ((f"{STATUSURL}{boxname}", join(path, "status", f"{boxname}.html")), (f"{PICURL}{boxname}.png", join(path, "boxes", f"{boxname}.png"))):
+			response = get(url, timeout=(3.05, 6))
+			if response.ok:
+				with open(filename, "wb") as file:
+					file.write(response.content)
+		print(f"recorded box '{boxname}'")
+
+
+def main(argv):
+	port, path, seed, boxnames, recording = 8765, FIXTURES, None, [], False
+	conditions = {}
+	try:
+		opts = getopt(argv, "p:f:rh", ["port=", "fixtures=", "record", "boxes=", "seed="] + [f"{key}=" for key in CONDITIONS] + ["help"])[0]
+	except GetoptError as error:
+		print(f"Error: {error}")
+		exit(2)
+	for opt, arg in opts:
+		if opt in ("-h", "--help"):
+			print("Usage  : python standin.py [options...]\n"
+				"Example: python standin.py --latency 200 --jitter 50 --errors 0.1\n"
+				"-p, --port <port>\t\tListen on port (default: 8765)\n"
+				f"-f, --fixtures <path>\t\tServe recorded data from path (default: '{FIXTURES}', synthesized data if nothing has been recorded)\n"
+				"-r, --record\t\t\tRecord content.json and all platform pages from the live servers into the fixtures path\n"
+				"    --boxes <box,...>\t\tAlso record server status and pictures of these boxes\n"
+				"    --latency <msec>\t\tDelay every response\n"
+				"    --jitter <msec>\t\tVary the delay randomly by +/- msec\n"
+				"    --bandwidth <bytes/sec>\tThrottle every response body\n"
+				"    --errors <rate>\t\tAnswer this share of requests with '503 Service Unavailable'\n"
+				"    --timeouts <rate>\t\tNever answer this share of requests\n"
+				"    --hang <sec>\t\tKeep unanswered requests open for sec seconds\n"
+				"    --seed <number>\t\tMake injected errors and timeouts reproducible\n"
+				"Conditions may be changed at runtime: 'http://127.0.0.1:<port>/_control?latency=200&errors=0.1'")
+			return
+		if opt in ("-p", "--port"):
+			port = int(arg)
+		elif opt in ("-f", "--fixtures"):
+			path = abspath(arg)
+		elif opt in ("-r", "--record"):
+			recording = True
+		elif opt == "--boxes":
+			boxnames = [x.strip() for x in arg.split(",") if x.strip()]
+		elif opt == "--seed":
+			seed = int(arg)
+		else:
+			conditions[opt[2:]] = float(arg)
+	if recording:
+		record(path, boxnames)
+		return
+	server = StandinServer(port, Fixtures(path), seed, **conditions)
+	print(f"serving {'recorded' if server.fixtures.content else 'synthesized'} data at {server.baseurl}, conditions: {server.conditions}")
+	for key, value in server.endpoints().items():
+		print(f"export {key}='{value}'")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		server.server_close()
+
+
+if __name__ == "__main__":
+	main(argv[1:])